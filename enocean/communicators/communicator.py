@@ -8,6 +8,7 @@ try:
     import queue
 except ImportError:
     import Queue as queue
+from enocean.protocol.framedecoder import FrameDecoder
 from enocean.protocol.packet import Packet, UTETeachInPacket
 from enocean.protocol.constants import PACKET, PARSE_RESULT, RETURN_CODE
 
@@ -19,12 +20,12 @@ class Communicator(threading.Thread):
     '''
     logger = logging.getLogger('enocean.communicators.Communicator')
 
-    def __init__(self, callback=None, teach_in=True):
+    def __init__(self, callback=None, teach_in=True, registry=None, deduplicator=None):
         super(Communicator, self).__init__()
         # Create an event to stop the thread
         self._stop_flag = threading.Event()
-        # Input buffer
-        self._buffer = []
+        # Decoder for the incoming ESP3 frames, owns the input buffer
+        self._decoder = FrameDecoder()
         # Setup packet queues
         self.transmit = queue.Queue()
         self.receive = queue.Queue()
@@ -35,6 +36,11 @@ class Communicator(threading.Thread):
         # Should new messages be learned automatically? Defaults to True.
         # TODO: Not sure if we should use CO_WR_LEARNMODE??
         self.teach_in = teach_in
+        # DeviceRegistry of the known devices. Packets from known devices are decoded automatically,
+        # and devices are learned from teach-in packets if teach_in is set.
+        self.registry = registry
+        # Deduplicator, dropping repeated telegrams before they're decoded or passed on.
+        self.deduplicator = deduplicator
 
     def _get_from_send_queue(self):
         ''' Get message from send queue, if one exists '''
@@ -52,34 +58,62 @@ class Communicator(threading.Thread):
             self.logger.error('Object to send must be an instance of Packet')
             return False
         self.transmit.put(packet)
+        self._wakeup()
         return True
 
     def stop(self):
         self._stop_flag.set()
+        self._wakeup()
 
-    def parse(self):
-        ''' Parses messages and puts them to receive queue '''
-        # Loop while we get new messages
-        while True:
-            status, self._buffer, packet = Packet.parse_msg(self._buffer)
-            # If message is incomplete -> break the loop
-            if status == PARSE_RESULT.INCOMPLETE:
-                return status
-
-            # If message is OK, add it to receive queue or send to the callback method
-            if status == PARSE_RESULT.OK and packet:
-                packet.received = datetime.datetime.now()
-
-                if isinstance(packet, UTETeachInPacket) and self.teach_in:
-                    response_packet = packet.create_response_packet(self.base_id)
-                    self.logger.info('Sending response to UTE teach-in.')
-                    self.send(response_packet)
-
-                if self.__callback is None:
-                    self.receive.put(packet)
-                else:
-                    self.__callback(packet)
-                self.logger.debug(packet)
+    def _wakeup(self):
+        ''' Wake up the communicator thread to send queued packets (or to stop), if it's waiting for data '''
+        pass
+
+    @property
+    def _buffer(self):
+        ''' Input buffer of the frame decoder '''
+        return self._decoder.buffer
+
+    @_buffer.setter
+    def _buffer(self, value):
+        self._decoder.buffer = bytearray(value)
+
+    def parse(self, data=None):
+        '''
+        Parses messages from received data (and the input buffer) and puts them to receive queue.
+        returns:
+            - PARSE_RESULT.OK, if at least one packet was passed on, otherwise PARSE_RESULT.INCOMPLETE
+        '''
+        status = PARSE_RESULT.INCOMPLETE
+        for frame in self._decoder.feed(data):
+            packet = Packet.parse_frame(frame)
+            packet.received = datetime.datetime.now()
+
+            if self.deduplicator is not None and self.deduplicator.is_duplicate(packet):
+                self.logger.debug('Dropping duplicate packet from %s.', packet.sender_hex)
+                continue
+
+            if isinstance(packet, UTETeachInPacket) and self.teach_in:
+                response_packet = packet.create_response_packet(self.base_id)
+                self.logger.info('Sending response to UTE teach-in.')
+                self.send(response_packet)
+
+            if self.registry is not None:
+                try:
+                    if self.teach_in:
+                        self.registry.learn(packet)
+                    self.registry.decode(packet)
+                except (ValueError, IndexError):
+                    self.logger.warning('Cannot decode packet from %s.', packet.sender_hex)
+
+            # Add packet to receive queue or send to the callback method
+            if self.__callback is None:
+                self.receive.put(packet)
+            else:
+                self.__callback(packet)
+            self.logger.debug(packet)
+            status = PARSE_RESULT.OK
+        return status
 
     @property
     def base_id(self):
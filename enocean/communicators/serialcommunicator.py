@@ -1,20 +1,80 @@
 # -*- encoding: utf-8 -*-
 from __future__ import print_function, unicode_literals, division, absolute_import
+import os
+import errno
 import logging
+import select
+import threading
 import serial
-import time
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
 
 from enocean.communicators.communicator import Communicator
 
 
 class SerialCommunicator(Communicator):
-    ''' Serial port communicator class for EnOcean radio '''
+    '''
+    Serial port communicator class for EnOcean radio.
+
+    The read loop blocks until data is received (or the read timeout passes),
+    and then reads and parses all the data waiting at once.
+    On POSIX systems, send() and stop() wake up the loop through a pipe,
+    so queued packets are written immediately instead of after the read timeout.
+
+    teach_in, registry and deduplicator are passed to Communicator, see Communicator.__init__().
+    '''
     logger = logging.getLogger('enocean.communicators.SerialCommunicator')
 
-    def __init__(self, port='/dev/ttyAMA0', callback=None):
-        super(SerialCommunicator, self).__init__(callback)
+    def __init__(self, port='/dev/ttyAMA0', callback=None, teach_in=True, registry=None, deduplicator=None):
+        super(SerialCommunicator, self).__init__(
+            callback, teach_in=teach_in, registry=registry, deduplicator=deduplicator)
         # Initialize serial port
         self.__ser = serial.Serial(port, 57600, timeout=0.1)
+        # File descriptor of the port for select(), not available on Windows
+        self.__fileno = self.__ser.fileno() if os.name == 'posix' and hasattr(self.__ser, 'fileno') else None
+        # Pipe for waking up the read loop, see _wakeup()
+        self.__wakeup_read = self.__wakeup_write = None
+        # Guards the pipe from being closed while writing to it
+        self.__wakeup_lock = threading.Lock()
+        if self.__fileno is not None and fcntl is not None:
+            self.__wakeup_read, self.__wakeup_write = os.pipe()
+            for fd in (self.__wakeup_read, self.__wakeup_write):
+                fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+    def _wakeup(self):
+        with self.__wakeup_lock:
+            if self.__wakeup_write is None:
+                return
+            try:
+                os.write(self.__wakeup_write, b'\x00')
+            except OSError as error:
+                # Full pipe wakes up the loop as well
+                if error.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    raise
+
+    def _read(self):
+        ''' Read all the data waiting, blocking until data is received or the read timeout passes '''
+        if self.__fileno is None:
+            # Wait for the first byte with a blocking read instead
+            data = self.__ser.read(1)
+        else:
+            descriptors = [self.__fileno] if self.__wakeup_read is None else [self.__fileno, self.__wakeup_read]
+            readable, _, _ = select.select(descriptors, [], [], self.__ser.timeout)
+            if self.__wakeup_read is not None and self.__wakeup_read in readable:
+                try:
+                    while os.read(self.__wakeup_read, 4096):
+                        pass
+                except OSError as error:
+                    if error.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                        raise
+            if self.__fileno not in readable:
+                return b''
+            data = b''
+        # Readable port without data waiting means disconnected device, which read() reports as SerialException.
+        return data + self.__ser.read(self.__ser.in_waiting or (0 if data else 1))
 
     def run(self):
         self.logger.info('SerialCommunicator started')
@@ -30,14 +90,20 @@ class SerialCommunicator(Communicator):
                 except serial.SerialException:
                     self.stop()
 
-            # Read chars from serial port as hex numbers
+            # Read all the received chars from serial port and feed them to the frame decoder at once
             try:
-                self._buffer.extend(bytearray(self.__ser.read(16)))
+                data = self._read()
             except serial.SerialException:
                 self.logger.error('Serial port exception! (device disconnected or multiple access on port?)')
                 self.stop()
-            self.parse()
-            time.sleep(0)
+                continue
+            if data:
+                self.parse(data)
 
         self.__ser.close()
+        with self.__wakeup_lock:
+            if self.__wakeup_read is not None:
+                os.close(self.__wakeup_read)
+                os.close(self.__wakeup_write)
+                self.__wakeup_read = self.__wakeup_write = None
         self.logger.info('SerialCommunicator stopped')
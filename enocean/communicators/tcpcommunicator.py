@@ -7,11 +7,14 @@ from enocean.communicators.communicator import Communicator
 
 
 class TCPCommunicator(Communicator):
-    ''' Socket communicator class for EnOcean radio '''
+    '''
+    Socket communicator class for EnOcean radio.
+    teach_in, registry and deduplicator are passed to Communicator, see Communicator.__init__().
+    '''
     logger = logging.getLogger('enocean.communicators.TCPCommunicator')
 
-    def __init__(self, host='', port=9637):
-        super(TCPCommunicator, self).__init__()
+    def __init__(self, host='', port=9637, teach_in=True, registry=None, deduplicator=None):
+        super(TCPCommunicator, self).__init__(teach_in=teach_in, registry=registry, deduplicator=deduplicator)
         self.host = host
         self.port = port
 
@@ -36,8 +39,7 @@ class TCPCommunicator(Communicator):
                     break
                 if not data:
                     break
-                self._buffer.extend(bytearray(data))
-            self.parse()
+                self.parse(data)
             client.close()
             self.logger.debug('Client disconnected')
         sock.close()
@@ -1,9 +1,17 @@
 # -*- encoding: utf-8 -*-
 from __future__ import print_function, unicode_literals, division, absolute_import
+import os
+import shutil
+import tempfile
 
 from enocean.communicators.communicator import Communicator
+from enocean.communicators.tcpcommunicator import TCPCommunicator
 from enocean.protocol.packet import Packet, RadioPacket
-from enocean.protocol.constants import PACKET
+from enocean.protocol.eep import EEP
+from enocean.protocol.registry import DeviceRegistry
+from enocean.protocol.decodecache import DecodeCache
+from enocean.protocol.deduplicator import Deduplicator
+from enocean.protocol.constants import PACKET, PARSE_RESULT
 from enocean.decorators import timing
 
 
@@ -20,12 +28,18 @@ def test_buffer():
     ])
     com = Communicator()
     com._buffer.extend(data[0:5])
-    com.parse()
+    assert com.parse() == PARSE_RESULT.INCOMPLETE
     assert com.receive.qsize() == 0
     com._buffer.extend(data[5:])
-    com.parse()
+    assert com.parse() == PARSE_RESULT.OK
     assert com.receive.qsize() == 1
 
+    # Input buffer can be replaced too
+    com._buffer = data
+    assert com.parse() == PARSE_RESULT.OK
+    assert com.receive.qsize() == 2
+    assert len(com._buffer) == 0
+
 
 @timing(1000)
 def test_send():
@@ -90,3 +104,102 @@ def test_base_id():
     com.parse()
     assert com.base_id == [0xFF, 0x87, 0xCA, 0x00]
     assert com.receive.qsize() == 2
+
+
+def test_registry():
+    data = bytearray([
+        0x55,
+        0x00, 0x0A, 0x07, 0x01,
+        0xEB,
+        0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+        0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+        0x75
+    ])
+    registry = DeviceRegistry()
+    registry.add(0x0181B744, 0xA5, 0x02, 0x05)
+    com = Communicator(registry=registry)
+    com.parse(data)
+    packet = com.receive.get()
+    assert round(packet.parsed['TMP']['value'], 1) == 26.7
+
+    # Packets from unknown devices are passed on without decoding
+    registry.remove(0x0181B744)
+    com.parse(data)
+    assert com.receive.get().parsed == {}
+
+
+def test_registry_cache():
+    data = bytearray([
+        0x55,
+        0x00, 0x0A, 0x07, 0x01,
+        0xEB,
+        0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+        0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+        0x75
+    ])
+    cache = DecodeCache()
+    registry = DeviceRegistry(eep=EEP(cache=cache))
+    registry.add(0x0181B744, 0xA5, 0x02, 0x05)
+    com = Communicator(registry=registry)
+    for i in range(3):
+        com.parse(data)
+        assert round(com.receive.get().parsed['TMP']['value'], 1) == 26.7
+    # Repeated frames are decoded once
+    assert (cache.hits, cache.misses) == (2, 1)
+    # ... sharing the cache with EEP.get_values()
+    _, _, packet = Packet.parse_msg(data)
+    registry.eep.get_values(registry.get(0x0181B744).profile, packet._bit_data, packet._bit_status)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_registry_learning():
+    teach_in = bytearray([
+        0x55,
+        0x00, 0x0A, 0x07, 0x01,
+        0xEB,
+        0xA5, 0x08, 0x28, 0x46, 0x80, 0x01, 0x8A, 0x7B, 0x30, 0x00,
+        0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x49, 0x00,
+        0x26
+    ])
+    registry = DeviceRegistry()
+    com = Communicator(registry=registry, teach_in=False)
+    com.parse(teach_in)
+    assert len(registry) == 0
+
+    com = Communicator(registry=registry)
+    com.parse(teach_in)
+    assert registry.get(0x018A7B30).rorg_type == 0x05
+
+    # Errors writing the registry don't stop receiving
+    directory = tempfile.mkdtemp()
+    registry = DeviceRegistry(path=os.path.join(directory, 'devices.log'))
+    shutil.rmtree(directory)
+    com = Communicator(registry=registry)
+    com.parse(teach_in)
+    assert com.receive.qsize() == 1
+    assert registry.get(0x018A7B30).rorg_type == 0x05
+
+
+def test_tcp_registry():
+    registry = DeviceRegistry()
+    com = TCPCommunicator(registry=registry, teach_in=False)
+    assert com.registry is registry
+    assert com.teach_in is False
+
+
+def test_duplicates():
+    packet = RadioPacket(
+        PACKET.RADIO_ERP1,
+        data=[0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00],
+        optional=[0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00])
+    repeated = RadioPacket(
+        PACKET.RADIO_ERP1,
+        data=[0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x01],
+        optional=[0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x50, 0x00])
+    com = Communicator(deduplicator=Deduplicator())
+    com.parse(bytearray(packet.build() + repeated.build() + packet.build()))
+    assert com.receive.qsize() == 1
+    assert com.deduplicator.duplicates == 2
+
+    deduplicator = Deduplicator()
+    assert TCPCommunicator(deduplicator=deduplicator).deduplicator is deduplicator
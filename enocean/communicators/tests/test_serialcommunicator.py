@@ -0,0 +1,175 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+import os
+import time
+import select
+from unittest import SkipTest
+
+try:
+    import pty
+except ImportError:
+    raise SkipTest('Pseudo-terminals are not supported')
+
+from enocean.communicators.serialcommunicator import SerialCommunicator
+from enocean.protocol.packet import Packet, RadioPacket
+from enocean.protocol.registry import DeviceRegistry
+from enocean.protocol.deduplicator import Deduplicator
+
+TEMPERATURE = bytes(bytearray([
+    0x55,
+    0x00, 0x0A, 0x07, 0x01,
+    0xEB,
+    0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+    0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+    0x75
+]))
+
+
+def fake_port(callback=None, **kwargs):
+    ''' SerialCommunicator reading from a pseudo-terminal, returns the communicator and the other end '''
+    master, slave = pty.openpty()
+    communicator = SerialCommunicator(port=os.ttyname(slave), callback=callback, **kwargs)
+    os.close(slave)
+    return communicator, master
+
+
+def test_read_burst():
+    communicator, master = fake_port()
+    communicator.start()
+    try:
+        # Burst of frames, with a partial frame at the end
+        os.write(master, TEMPERATURE * 20 + TEMPERATURE[:10])
+        packets = [communicator.receive.get(timeout=1) for i in range(20)]
+        assert all(isinstance(packet, RadioPacket) for packet in packets)
+        os.write(master, TEMPERATURE[10:])
+        assert communicator.receive.get(timeout=1).sender_int == 0x0181B744
+    finally:
+        communicator.stop()
+        communicator.join(1)
+        os.close(master)
+    assert not communicator.is_alive()
+
+
+def test_registry():
+    registry = DeviceRegistry()
+    registry.add(0x0181B744, 0xA5, 0x02, 0x05)
+    communicator, master = fake_port(registry=registry, teach_in=False)
+    assert communicator.teach_in is False
+    communicator.start()
+    try:
+        os.write(master, TEMPERATURE)
+        packet = communicator.receive.get(timeout=1)
+        assert round(packet.parsed['TMP']['value'], 1) == 26.7
+    finally:
+        communicator.stop()
+        communicator.join(1)
+        os.close(master)
+
+
+def test_duplicates():
+    communicator, master = fake_port(deduplicator=Deduplicator())
+    communicator.start()
+    try:
+        os.write(master, TEMPERATURE * 3)
+        communicator.receive.get(timeout=1)
+        # Wait for the repeated frames to be dropped
+        deadline = time.time() + 1
+        while communicator.deduplicator.duplicates < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert communicator.deduplicator.duplicates == 2
+        assert communicator.receive.empty()
+    finally:
+        communicator.stop()
+        communicator.join(1)
+        os.close(master)
+
+
+def read_frame(master, timeout=1.0):
+    ''' Read a TEMPERATURE -sized frame from the other end of the port, returns the frame and the time it was read '''
+    frame = b''
+    deadline = time.time() + timeout
+    while len(frame) < len(TEMPERATURE):
+        if not select.select([master], [], [], max(deadline - time.time(), 0))[0]:
+            break
+        frame += os.read(master, len(TEMPERATURE) - len(frame))
+    return frame, time.time()
+
+
+def test_send():
+    communicator, master = fake_port()
+    communicator.start()
+    try:
+        # Let the loop block on reading
+        time.sleep(0.05)
+        communicator.send(Packet.parse_frame(TEMPERATURE))
+        frame, _ = read_frame(master)
+        assert frame == TEMPERATURE
+    finally:
+        communicator.stop()
+        communicator.join(1)
+        os.close(master)
+    assert not communicator.is_alive()
+
+
+def test_send_benchmark():
+    ''' Latency from send() to the frame written, run with WITH_TIMINGS=1 '''
+    if os.environ.get('WITH_TIMINGS', None) != '1':
+        raise SkipTest('Benchmarks are run only with WITH_TIMINGS=1')
+
+    communicator, master = fake_port()
+    communicator.start()
+    packet = Packet.parse_frame(TEMPERATURE)
+    latencies = []
+    try:
+        for i in range(200):
+            # Send at random points of the read timeout
+            time.sleep(0.001 + (i * 7919 % 100) / 1e3)
+            sent = time.time()
+            communicator.send(packet)
+            frame, written = read_frame(master)
+            assert frame == TEMPERATURE
+            latencies.append(written - sent)
+    finally:
+        communicator.stop()
+        communicator.join(1)
+        os.close(master)
+    latencies.sort()
+    print('Send latency p50 %.3f ms, p99 %.3f ms' % (
+        1e3 * latencies[len(latencies) // 2], 1e3 * latencies[len(latencies) * 99 // 100]))
+
+
+def test_benchmark():
+    ''' CPU usage and latency of the read loop at 0, 100 and 1000 frames/s, run with WITH_TIMINGS=1 '''
+    if os.environ.get('WITH_TIMINGS', None) != '1':
+        raise SkipTest('Benchmarks are run only with WITH_TIMINGS=1')
+
+    duration = 2.0
+    for rate in (0, 100, 1000):
+        received = []
+        communicator, master = fake_port(callback=lambda packet: received.append(time.time()))
+        communicator.start()
+        sent = []
+        cpu_start = time.process_time() if hasattr(time, 'process_time') else time.clock()
+        start = time.time()
+        while time.time() - start < duration:
+            if rate:
+                # Send at the given rate, without drifting
+                next_frame = start + len(sent) / rate
+                time.sleep(max(next_frame - time.time(), 0))
+                sent.append(time.time())
+                os.write(master, TEMPERATURE)
+            else:
+                time.sleep(duration)
+        time.sleep(0.2)
+        cpu = (time.process_time() if hasattr(time, 'process_time') else time.clock()) - cpu_start
+        communicator.stop()
+        communicator.join(1)
+        os.close(master)
+
+        assert len(received) == len(sent)
+        latencies = sorted(received[i] - sent[i] for i in range(len(sent)))
+        print('%4d frames/s: CPU %5.1f%%, latency p50 %.3f ms, p99 %.3f ms' % (
+            rate,
+            100 * cpu / (time.time() - start),
+            1e3 * latencies[len(latencies) // 2] if latencies else 0,
+            1e3 * latencies[len(latencies) * 99 // 100] if latencies else 0))
@@ -0,0 +1,186 @@
+# -*- encoding: utf-8 -*-
+'''
+Batch processing of recorded ESP3 byte streams.
+Requires NumPy (pip install enocean[bulk]).
+'''
+from __future__ import print_function, unicode_literals, division, absolute_import
+from collections import OrderedDict
+
+import numpy as np
+
+from enocean.protocol import crc8
+from enocean.protocol.eep import EEP
+from enocean.protocol.framedecoder import HEADER_LENGTH
+from enocean.protocol.packet import Packet
+
+CRC_TABLE = np.array(crc8.CRC_TABLE, dtype=np.uint8)
+
+FRAME_DTYPE = np.dtype([
+    ('offset', np.int64),
+    ('data_len', np.uint16),
+    ('opt_len', np.uint8),
+    ('packet_type', np.uint8),
+    ('valid', np.bool_),
+])
+
+
+def _as_array(buffer):
+    ''' Returns buffer (bytes, bytearray, memoryview or list of integers) as uint8 array '''
+    if isinstance(buffer, np.ndarray):
+        return buffer.astype(np.uint8, copy=False)
+    if isinstance(buffer, list):
+        return np.array(buffer, dtype=np.uint8)
+    return np.frombuffer(buffer, dtype=np.uint8)
+
+
+def crc(buf, starts, lengths):
+    '''
+    Calculates CRC8 for each of the slices buf[start:start + length].
+    All slices are processed in parallel, one byte position at a time.
+    '''
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    checksums = np.zeros(len(starts), dtype=np.uint8)
+    if not len(starts):
+        return checksums
+
+    # Process the longest slices first, so the active slices are always a prefix of the arrays.
+    order = np.argsort(-lengths, kind='stable')
+    starts = starts[order]
+    lengths = lengths[order]
+    # Number of slices longer than i, for each byte position i
+    active = np.searchsorted(-lengths, -np.arange(lengths[0]), side='left')
+    result = np.zeros(len(starts), dtype=np.uint8)
+    for i, count in enumerate(active):
+        result[:count] = CRC_TABLE[result[:count] ^ buf[starts[:count] + i]]
+    checksums[order] = result
+    return checksums
+
+
+def frame_offsets(buffer):
+    '''
+    Finds all ESP3 frames from buffer in one pass.
+    Uses the same rules as enocean.protocol.framedecoder.FrameDecoder:
+    candidate sync bytes with invalid header CRC are skipped and frames with valid header
+    are consumed completely, regardless of the data CRC. An incomplete frame at the end of
+    the buffer is ignored.
+    returns:
+        - array of FRAME_DTYPE (offset, data_len, opt_len, packet_type, valid),
+          valid is True if the data CRC matches
+    '''
+    buf = _as_array(buffer)
+
+    # Candidate sync bytes, with the complete header in the buffer.
+    starts = np.flatnonzero(buf[:max(len(buf) - HEADER_LENGTH + 1, 0)] == 0x55)
+
+    # Validate header CRCs of all candidates
+    checksum = np.zeros(len(starts), dtype=np.uint8)
+    for i in range(1, 5):
+        checksum = CRC_TABLE[checksum ^ buf[starts + i]]
+    starts = starts[checksum == buf[starts + 5]]
+
+    data_len = (buf[starts + 1].astype(np.int64) << 8) | buf[starts + 2]
+    opt_len = buf[starts + 3].astype(np.int64)
+    ends = starts + HEADER_LENGTH + data_len + opt_len + 1
+
+    # Walk the chain of frames, each frame continuing from the first candidate after the previous one.
+    following = np.searchsorted(starts, ends, side='left').tolist()
+    ends_list = ends.tolist()
+    length = len(buf)
+    chain = []
+    i = 0
+    while i < len(following) and ends_list[i] <= length:
+        chain.append(i)
+        i = following[i]
+
+    frames = np.zeros(len(chain), dtype=FRAME_DTYPE)
+    starts = starts[chain]
+    frames['offset'] = starts
+    frames['data_len'] = data_len[chain]
+    frames['opt_len'] = opt_len[chain]
+    frames['packet_type'] = buf[starts + 4]
+    lengths = data_len[chain] + opt_len[chain]
+    frames['valid'] = crc(buf, starts + HEADER_LENGTH, lengths) == buf[starts + HEADER_LENGTH + lengths]
+    return frames
+
+
+def packets(buffer, frames=None):
+    '''
+    Generator for Packet -objects, built on demand from the valid frames in buffer.
+    frames defaults to frame_offsets(buffer).
+    '''
+    if frames is None:
+        frames = frame_offsets(buffer)
+    view = memoryview(_as_array(buffer))
+    for offset, data_len, opt_len, _, valid in frames.tolist():
+        if valid:
+            yield Packet.parse_frame(view[offset:offset + HEADER_LENGTH + data_len + opt_len + 1])
+
+
+def _as_rows(payloads):
+    ''' Returns payloads (2D array, or sequence of equally long bytes-like objects) as 2D uint8 array '''
+    if isinstance(payloads, np.ndarray):
+        rows = payloads.astype(np.uint8, copy=False)
+    else:
+        payloads = [bytes(bytearray(payload)) for payload in payloads]
+        width = len(payloads[0]) if payloads else 0
+        if any(len(payload) != width for payload in payloads):
+            raise ValueError('All payloads must be of the same length.')
+        rows = np.frombuffer(b''.join(payloads), dtype=np.uint8).reshape(len(payloads), width)
+    if rows.ndim != 2:
+        raise ValueError('Payloads must be a 2-dimensional array.')
+    return rows
+
+
+def _get_raw(rows, offset, size):
+    ''' Get raw values of the field at offset (in bits, from the most significant bit) with size for all rows '''
+    first = offset // 8
+    last = (offset + size - 1) // 8
+    if last >= rows.shape[1]:
+        raise IndexError('Bit field out of range')
+    if last - first >= 8:
+        raise ValueError('Fields longer than 57 bits are not supported.')
+    raw = np.zeros(len(rows), dtype=np.uint64)
+    for byte in range(first, last + 1):
+        raw = (raw << np.uint64(8)) | rows[:, byte]
+    raw >>= np.uint64((last + 1) * 8 - offset - size)
+    return raw & np.uint64((1 << size) - 1)
+
+
+def decode_profile(profile, payloads, status=None, fields=None):
+    '''
+    Decodes all fields of the compiled profile (see EEP.find_profile()) vectorially,
+    or only the fields with shortcuts in fields, if given.
+    payloads contains the data bytes (the bytes of Packet._bit_data) of each telegram, one row per telegram.
+    status contains the status byte of each telegram, fields in status are left out if it's not given.
+    returns:
+        - OrderedDict of {shortcut: {'raw_value': array, 'value': array}}.
+          Values of enums are the descriptions (None for unknown values) and values of status -fields booleans.
+    '''
+    rows = _as_rows(payloads)
+    if status is not None:
+        status = np.asarray(status, dtype=np.uint8).reshape(-1, 1)
+        if len(status) != len(rows):
+            raise ValueError('Status must be given for each payload.')
+
+    output = OrderedDict()
+    for field in profile.fields:
+        if fields is not None and field.shortcut not in fields:
+            continue
+        if field.kind == 'status':
+            if status is None:
+                continue
+            raw = _get_raw(status, field.offset, field.size)
+            value = raw != 0
+        else:
+            raw = _get_raw(rows, field.offset, field.size)
+        if field.kind == 'value':
+            value = field.slope * (raw.astype(np.float64) - field.range_min) + field.scale_min
+        if field.kind == 'enum':
+            # Descriptions are only looked up once per distinct raw value.
+            uniques, inverse = np.unique(raw, return_inverse=True)
+            labels = np.empty(len(uniques), dtype=object)
+            labels[:] = [EEP._get_label(field, int(unique)) for unique in uniques]
+            value = labels[inverse.reshape(-1)]
+        output[field.shortcut] = {'raw_value': raw, 'value': value}
+    return output
@@ -34,8 +34,29 @@ CRC_TABLE = (
     0xfa, 0xfd, 0xf4, 0xf3)
 
 
-def calc(msg):
-    checksum = 0
+def calc(msg, checksum=0):
+    '''
+    Calculates CRC8 of msg.
+    msg can be a list of integers or any bytes-like object (bytes, bytearray, memoryview),
+    slices of memoryviews are processed without copying.
+    checksum continues the calculation from the CRC8 of the data preceding msg.
+    '''
     for byte in msg:
-        checksum = CRC_TABLE[checksum & 0xFF ^ byte & 0xFF]
+        checksum = CRC_TABLE[checksum ^ byte]
     return checksum
+
+
+def validate_frame(frame):
+    '''
+    Checks both header and data CRC of a complete ESP3 frame (sync byte to data CRC).
+    returns:
+        - True, if the frame is complete and both CRCs match
+    '''
+    if not isinstance(frame, (list, memoryview)):
+        frame = memoryview(frame)
+    if len(frame) < 7:
+        return False
+    data_end = 6 + ((frame[1] << 8) | frame[2]) + frame[3]
+    if len(frame) != data_end + 1:
+        return False
+    return frame[5] == calc(frame[1:5]) and frame[data_end] == calc(frame[6:data_end])
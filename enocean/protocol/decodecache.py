@@ -0,0 +1,109 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+import threading
+from collections import OrderedDict
+
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python 2, read-only view of a dictionary
+    from collections import Mapping
+
+    class MappingProxyType(Mapping):
+        __slots__ = ('_mapping',)
+
+        def __init__(self, mapping):
+            self._mapping = mapping
+
+        def __getitem__(self, key):
+            return self._mapping[key]
+
+        def __iter__(self):
+            return iter(self._mapping)
+
+        def __len__(self):
+            return len(self._mapping)
+
+        def __repr__(self):
+            return 'MappingProxyType(%r)' % (self._mapping,)
+
+
+def freeze(output):
+    ''' Read-only view of the output of EEP.get_values(), with the values of each field read-only too '''
+    return MappingProxyType(OrderedDict(
+        (shortcut, MappingProxyType(values))
+        for shortcut, values in output.items()
+    ))
+
+
+class DecodeCache(object):
+    '''
+    Bounded cache of decoded values, see EEP(cache=DecodeCache()).
+
+    Most devices send only a few distinct payloads (a rocker switch has a handful of
+    byte patterns, thermostats repeat the same values), so the values are decoded once
+    per compiled profile, data and status and shared between the packets.
+    The cached values are read-only (see freeze()), as they are shared.
+
+    size is the maximum number of cached payloads. When the cache is full, the least recently
+    used payload is evicted with policy 'lru', or the oldest payload with policy 'fifo'.
+    '''
+    POLICIES = ('lru', 'fifo')
+
+    def __init__(self, size=1024, policy='lru'):
+        if size < 1:
+            raise ValueError('Cache size must be at least 1.')
+        if policy not in self.POLICIES:
+            raise ValueError('Unknown eviction policy "%s", expected one of %s.' % (policy, ', '.join(self.POLICIES)))
+        self.size = size
+        self.policy = policy
+        # (profile, values) by id() of the compiled profile, data, data width and status
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def decode(self, decoder, profile, bitarray, status, fields=None):
+        '''
+        Get values of data and status (as BitView) of the compiled profile,
+        calling decoder(bitarray, status) if they aren't cached.
+        fields identifies the fields decoder decodes, if it doesn't decode all of them.
+        returns:
+            - read-only OrderedDict of the values, in the format of EEP.get_values()
+        '''
+        # The integer values of BitViews identify the payload, without converting them to bytes.
+        key = (id(profile), bitarray.value, bitarray.width, status.value, fields)
+        with self._lock:
+            entry = self._entries.get(key)
+            # Compare the profile too, as the id() may be reused for another object
+            if entry is not None and entry[0] is profile:
+                self.hits += 1
+                if self.policy == 'lru':
+                    self._move_to_end(key)
+                return entry[1]
+            self.misses += 1
+
+        # Decode outside of the lock, errors aren't cached.
+        output = freeze(decoder(bitarray, status))
+        with self._lock:
+            self._entries[key] = (profile, output)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return output
+
+    def _move_to_end(self, key):
+        try:
+            self._entries.move_to_end(key)
+        except AttributeError:
+            # Python 2
+            self._entries[key] = self._entries.pop(key)
+
+    def clear(self):
+        ''' Remove all cached values, the counters are left as they are '''
+        with self._lock:
+            self._entries.clear()
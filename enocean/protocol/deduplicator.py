@@ -0,0 +1,113 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+import time
+import logging
+
+from enocean.protocol.packet import RadioPacket
+
+try:
+    _monotonic = time.monotonic
+except AttributeError:
+    # Python 2
+    _monotonic = time.time
+
+
+class Deduplicator(object):
+    '''
+    Suppression of repeated telegrams.
+
+    With repeaters and multiple receivers, the same telegram arrives several times,
+    differing only in the repeater count (the low nibble of status) and in the optional data (dBm).
+    A radio packet is a duplicate, if a packet with the same type, data (sender included),
+    status (repeater count excluded) and destination was seen within window seconds.
+
+    Seen packets are indexed in a dictionary, and expired with a ring of buckets,
+    each containing the packets seen during window / buckets seconds.
+    So checking a packet is a single dictionary lookup, and each packet is expired once.
+
+    Packets are never modified, as the first copy has already been dispatched.
+    The strongest copy received (with its optional data, dBm and repeater count)
+    is available from strongest() while the packet is within the window.
+    '''
+    logger = logging.getLogger('enocean.protocol.deduplicator')
+
+    def __init__(self, window=0.5, buckets=10, clock=None):
+        if window <= 0 or buckets < 1:
+            raise ValueError('Window and number of buckets must be positive.')
+        self.window = window
+        self._bucket_width = window / buckets
+        self._clock = _monotonic if clock is None else clock
+        # Strongest copy of the packets seen, by key
+        self._index = {}
+        # Keys of the packets, by bucket
+        self._ring = [[] for _ in range(buckets)]
+        self._tick = None
+        # Number of duplicates suppressed
+        self.duplicates = 0
+
+    @staticmethod
+    def _key(packet):
+        data = packet._data
+        optional = packet._optional
+        return (
+            packet.packet_type,
+            bytes(bytearray(data[:-1])),
+            # Status, without the repeater count
+            data[-1] & 0xF0 if data else None,
+            # Destination
+            bytes(bytearray(optional[1:5])),
+        )
+
+    def _advance(self, tick):
+        ''' Expire the buckets, which have fallen out of the window by tick '''
+        # Clear everything, if the whole window has passed (or the clock went backwards)
+        if self._tick is None or not 0 < tick - self._tick < len(self._ring):
+            self.clear()
+        else:
+            for passed in range(self._tick + 1, tick + 1):
+                bucket = self._ring[passed % len(self._ring)]
+                for key in bucket:
+                    del self._index[key]
+                del bucket[:]
+        self._tick = tick
+
+    def is_duplicate(self, packet):
+        '''
+        Check, if packet is a duplicate of a packet seen within the window.
+        New packets are added to the index. Only radio packets can be duplicates.
+        '''
+        if not isinstance(packet, RadioPacket):
+            return False
+        tick = int(self._clock() // self._bucket_width)
+        if tick != self._tick:
+            self._advance(tick)
+
+        key = self._key(packet)
+        original = self._index.get(key)
+        if original is None:
+            self._index[key] = packet
+            self._ring[tick % len(self._ring)].append(key)
+            return False
+
+        self.duplicates += 1
+        if packet.dBm > original.dBm:
+            self._index[key] = packet
+        return True
+
+    def strongest(self, packet):
+        '''
+        Get the copy of packet received with the strongest signal within the window,
+        returns packet itself, if it isn't a radio packet or hasn't been seen.
+        '''
+        if not isinstance(packet, RadioPacket):
+            return packet
+        return self._index.get(self._key(packet), packet)
+
+    def __len__(self):
+        return len(self._index)
+
+    def clear(self):
+        ''' Forget all seen packets '''
+        self._index.clear()
+        for bucket in self._ring:
+            del bucket[:]
@@ -0,0 +1,98 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+import logging
+from collections import OrderedDict
+
+
+class _State(object):
+    ''' Last telegram and the last emitted values of a sender and profile '''
+    __slots__ = ('profile', 'payload', 'emitted')
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.payload = None
+        # Last emitted value and raw value, by shortcut
+        self.emitted = {}
+
+
+class DeltaDecoder(object):
+    '''
+    Change-only decoding of packets.
+
+    Keeps the last payload and the last emitted values for each sender and profile,
+    and returns only the values that changed since they were last emitted.
+    If the payload (data and status) is identical to the previous telegram, nothing is decoded.
+
+    deadbands is an optional dictionary of {shortcut: deadband}. Scaled values of these fields
+    are emitted only if they differ from the last emitted value by at least the deadband,
+    other fields are emitted when their raw value changes.
+    '''
+    logger = logging.getLogger('enocean.protocol.delta')
+
+    def __init__(self, deadbands=None):
+        self.deadbands = dict(deadbands or {})
+        self._states = {}
+        # Number of telegrams skipped as identical to the previous one
+        self.identical = 0
+        # Number of telegrams decoded, but without changes to emit
+        self.unchanged = 0
+
+    def decode(self, packet, rorg_func=None, rorg_type=None, direction=None, command=None):
+        '''
+        Decode the changed values of packet, with the EEP selected by FUNC and TYPE
+        (or the EEP already selected for the packet, see Packet.select_eep()).
+        Packet.parsed is updated, if the packet is decoded.
+        Values already parsed with the same EEP (by DeviceRegistry.decode() for example) aren't decoded again.
+        returns:
+            - OrderedDict of the changed values, in the format of Packet.parsed.
+              Empty, if nothing changed or if the EEP isn't found.
+        '''
+        selected = packet._profile
+        if rorg_func is not None and rorg_type is not None:
+            packet.select_eep(rorg_func, rorg_type, direction, command)
+        profile = packet._profile
+        if profile is None:
+            return OrderedDict()
+
+        key = (packet.sender_int, id(profile))
+        state = self._states.get(key)
+        # Compare the profile too, as the id() may be reused for another object
+        if state is None or state.profile is not profile:
+            state = self._states[key] = _State(profile)
+
+        payload = (bytes(bytearray(packet._data[1:len(packet._data) - 5])), packet.status)
+        if payload == state.payload:
+            self.identical += 1
+            return OrderedDict()
+
+        parsed = packet._parsed
+        if profile is not selected or not isinstance(parsed, dict) or \
+                any(field.shortcut not in parsed for field in profile.fields):
+            packet.parse_eep()
+        # Only remember the payload after it was decoded successfully, so failing payloads are retried.
+        state.payload = payload
+        changes = OrderedDict()
+        for shortcut, values in packet.parsed.items():
+            emitted = state.emitted.get(shortcut)
+            if emitted is not None:
+                deadband = self.deadbands.get(shortcut)
+                if deadband is not None and isinstance(values['value'], float):
+                    if abs(values['value'] - emitted[0]) < deadband:
+                        continue
+                elif values['raw_value'] == emitted[1]:
+                    continue
+            state.emitted[shortcut] = (values['value'], values['raw_value'])
+            changes[shortcut] = values
+
+        if not changes:
+            self.unchanged += 1
+        return changes
+
+    def forget(self, sender):
+        ''' Forget the state of sender (sender ID as integer), so the next telegram is emitted completely '''
+        for key in [key for key in self._states if key[0] == sender]:
+            del self._states[key]
+
+    def reset(self):
+        ''' Forget the state of all senders '''
+        self._states.clear()
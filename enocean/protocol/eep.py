@@ -1,45 +1,287 @@
 # -*- encoding: utf-8 -*-
 from __future__ import print_function, unicode_literals, division, absolute_import
 import os
+import re
+import bisect
 import logging
-from sys import version_info
-from collections import OrderedDict
-from bs4 import BeautifulSoup
+import pickle
+import zlib
+from collections import OrderedDict, namedtuple
 
 import enocean.utils
 # Left as a helper
 from enocean.protocol.constants import RORG  # noqa: F401
 
+EEP_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'EEP.xml')
+# Compiled profiles are cached next to EEP.xml, so the XML is parsed only when it changes.
+CACHE_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'EEP.pickle')
+# Cache used, if the installation isn't writable (installed by root for example).
+USER_CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'enocean', 'EEP.pickle')
+# Increase, when the format of the compiled profiles changes.
+CACHE_VERSION = 3
+
+# Field of a profile, as described by <value>, <enum> or <status> -tag in the XML.
+# Numeric values are decoded as slope * (raw_value - range_min) + scale_min.
+# Enums are looked up from
+#   - labels: {raw_value: description, formatted with the value}, for the <item> -tags
+#   - rangeitems: sorted, non-overlapping (start, end, description, parts) of the <rangeitem> -tags,
+#     parts being the description split at "{value}". range_starts contains the starts for bisect.
+# items ({raw_value: description}) and values ({description: raw_value}) are used for setting enums.
+EEPField = namedtuple('EEPField', [
+    'kind', 'shortcut', 'description', 'unit', 'offset', 'size',
+    'range_min', 'range_max', 'scale_min', 'scale_max', 'slope',
+    'items', 'labels', 'values', 'rangeitems', 'range_starts',
+])
+
+# Compiled <data> -tag of a profile, returned by EEP.find_profile().
+# Fields are in the order of the XML, shortcuts maps shortcut to the (first) field using it.
+EEPData = namedtuple('EEPData', ['fields', 'shortcuts', 'bits', 'direction', 'command'])
+
+# Compiled <profile> -tag, with the <command> -field (if defined) and the <data> -tags.
+EEPProfile = namedtuple('EEPProfile', ['description', 'command', 'data'])
+
+
+class EEPRecord(tuple):
+    '''
+    Base class of decoded records, generated for each profile (see EEP.record_class()).
+
+    A record holds only the value and the raw value of each field, available as attributes
+    (<shortcut> and <shortcut>_raw, with characters not allowed in identifiers replaced by "_")
+    or by value(shortcut) and raw_value(shortcut).
+    The metadata, which is the same for all the records of a profile, is stored in the class:
+    profile, shortcuts, descriptions and units.
+    '''
+    __slots__ = ()
+    profile = None
+    shortcuts = ()
+    descriptions = {}
+    units = {}
+    _index = {}
+
+    def value(self, shortcut):
+        return self[self._index[shortcut]]
+
+    def raw_value(self, shortcut):
+        return self[self._index[shortcut] + len(self.shortcuts)]
+
+    def as_dict(self):
+        ''' Values in the same format as returned by EEP.get_values() '''
+        count = len(self.shortcuts)
+        return OrderedDict(
+            (shortcut, {
+                'description': self.descriptions[shortcut],
+                'unit': self.units[shortcut],
+                'value': self[i],
+                'raw_value': self[i + count],
+            })
+            for i, shortcut in enumerate(self.shortcuts)
+        )
+
+
+def _split_template(description):
+    ''' Split description at "{value}", returns None if it has other replacement fields '''
+    parts = tuple(description.split('{value}'))
+    if any('{' in part or '}' in part for part in parts):
+        return None
+    return parts
+
+
+def _interval_table(rangeitems):
+    '''
+    Convert (start, end, description) -tuples to sorted, non-overlapping (start, end, description, parts).
+    Overlapping parts are left to the rangeitem listed first, as it was matched first.
+    '''
+    table = []
+    for start, end, description in rangeitems:
+        pieces = [(start, end)]
+        for used_start, used_end, _, _ in table:
+            # Remove the range already in use from each piece, leaving the parts before and after it
+            pieces = [
+                (low, high)
+                for low_end, high_end in pieces
+                for low, high in ((low_end, min(high_end, used_start - 1)), (max(low_end, used_end + 1), high_end))
+                if low <= high
+            ]
+        parts = _split_template(description)
+        table.extend((low, high, description, parts) for low, high in pieces)
+    return tuple(sorted(table))
+
+
+def _projection(fields):
+    ''' Normalize shortcuts of the fields to decode to a tuple (None for all fields) '''
+    if fields is None:
+        return None
+    if isinstance(fields, (type(''), str)):
+        return (fields, )
+    return tuple(fields)
+
 
 class EEP(object):
+    '''
+    EnOcean Equipment Profiles, loaded from EEP.xml.
+
+    cache is an optional enocean.protocol.decodecache.DecodeCache. If set, get_values() returns
+    the values of repeated payloads from it, as read-only mappings shared between the packets.
+    '''
     logger = logging.getLogger('enocean.protocol.eep')
 
-    def __init__(self):
-        self.init_ok = False
-        self.telegrams = {}
+    def __init__(self, cache=None):
+        # Optional DecodeCache for get_values()
+        self.cache = cache
+        # None until the profiles are loaded, see init_ok
+        self._init_ok = None
+        # Pickled profiles, by RORG. Loaded from cache (or compiled) on first use.
+        self._sections = None
+        # Unpickled profiles, by RORG, FUNC and TYPE
+        self._telegrams = {}
+        # Compiled profiles, by RORG, FUNC, TYPE, direction and command
+        self._compiled = {}
+        # Command dispatch tables, by RORG, FUNC, TYPE and direction
+        self._commands = {}
+        # Generated decoder functions, by id() of the compiled profile
+        self._decoders = {}
+        self._soup = None
+
+    @property
+    def init_ok(self):
+        ''' True, if the profiles were loaded successfully. Loads the profiles, if not yet loaded. '''
+        if self._init_ok is None:
+            self._load()
+        return self._init_ok
+
+    @init_ok.setter
+    def init_ok(self, value):
+        self._init_ok = value
+
+    @property
+    def telegrams(self):
+        ''' Compiled profiles of all RORGs, by RORG, FUNC and TYPE '''
+        self.preload()
+        return self._telegrams
+
+    def preload(self, rorgs=None):
+        '''
+        Load profiles of the given RORGs (by default all of them) now, instead of on first use.
+        Useful for services, which don't want to pay the loading time when the first telegram arrives.
+        returns:
+            - init_ok
+        '''
+        self._load()
+        for rorg in (self._sections if rorgs is None else rorgs):
+            self._section(rorg)
+        return self.init_ok
+
+    def _load(self):
+        ''' Load pickled profiles from cache, compiling them from the XML if needed '''
+        if self._sections is not None:
+            return
 
-        eep_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'EEP.xml')
         try:
-            if version_info[0] > 2:
-                with open(eep_path, 'r', encoding='UTF-8') as xml_file:
-                    self.soup = BeautifulSoup(xml_file.read(), "html.parser")
-            else:
-                with open(eep_path, 'r') as xml_file:
-                    self.soup = BeautifulSoup(xml_file.read(), "html.parser")
-            self.init_ok = True
-            self.__load_xml()
+            with open(EEP_PATH, 'rb') as xml_file:
+                xml = xml_file.read()
         except IOError:
             # Impossible to test with the current structure?
             # To be honest, as the XML is included with the library,
             # there should be no possibility of ever reaching this...
             self.logger.warn('Cannot load protocol file!')
-            self.init_ok = False
+            self._sections = {}
+            if self._init_ok is None:
+                self._init_ok = False
+            return
+
+        digest = (len(xml), zlib.crc32(xml) & 0xFFFFFFFF)
+        sections = self._read_cache(digest)
+        if sections is None:
+            self._soup = self._parse_xml(xml)
+            telegrams = self.__load_xml()
+            sections = dict(
+                (rorg, pickle.dumps(profiles, protocol=2))
+                for rorg, profiles in telegrams.items()
+            )
+            self._write_cache(digest, sections)
+            self._telegrams.update(telegrams)
+        self._sections = sections
+        if self._init_ok is None:
+            self._init_ok = True
+
+    def _section(self, rorg):
+        ''' Get profiles of RORG by FUNC and TYPE, returns None if RORG isn't found '''
+        if rorg not in self._telegrams:
+            self._load()
+            if rorg not in self._sections:
+                return None
+            self._telegrams[rorg] = pickle.loads(self._sections[rorg])
+        return self._telegrams[rorg]
+
+    @property
+    def soup(self):
+        ''' EEP.xml parsed by BeautifulSoup, only parsed when needed '''
+        if self._soup is None:
+            with open(EEP_PATH, 'rb') as xml_file:
+                self._soup = self._parse_xml(xml_file.read())
+        return self._soup
+
+    @staticmethod
+    def _parse_xml(xml):
+        # BeautifulSoup is only needed for compiling the profiles, so import it only when needed.
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(xml.decode('UTF-8'), "html.parser")
+
+    def _read_cache(self, digest):
+        ''' Read pickled profiles from cache, returns None if cache is missing or outdated '''
+        for path in (CACHE_PATH, USER_CACHE_PATH):
+            try:
+                with open(path, 'rb') as cache_file:
+                    cache = pickle.load(cache_file)
+            except Exception:
+                self.logger.debug('Cannot read cached profiles from %s.', path)
+                continue
+            if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION or cache.get('digest') != digest:
+                self.logger.debug('Cached profiles in %s are outdated.', path)
+                continue
+            return cache['sections']
+        self.logger.debug('No cached profiles found, compiling them.')
+        return None
+
+    def _write_cache(self, digest, sections):
+        '''
+        Write pickled profiles to cache next to EEP.xml, or to the user's cache directory,
+        if the installation isn't writable. Errors are ignored, the profiles are compiled again next time.
+        '''
+        # Each RORG is pickled separately, so only the RORGs in use need to be unpickled.
+        cache = {'version': CACHE_VERSION, 'digest': digest, 'sections': sections}
+        for path in (CACHE_PATH, USER_CACHE_PATH):
+            if self._write_cache_file(path, cache):
+                return True
+        self.logger.warning('Cannot write cached profiles, EEP.xml is parsed on every start.')
+        return False
+
+    def _write_cache_file(self, path, cache):
+        ''' Write cache to path, returns True on success '''
+        temporary_path = '%s.%d' % (path, os.getpid())
+        try:
+            directory = os.path.dirname(path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(temporary_path, 'wb') as cache_file:
+                pickle.dump(cache, cache_file, protocol=2)
+            # Replace the cache at once, so concurrent processes never read a partial file.
+            os.rename(temporary_path, path)
+            return True
+        except (IOError, OSError):
+            self.logger.debug('Cannot write cached profiles to %s.', path)
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            return False
 
     def __load_xml(self):
-        self.telegrams = {
+        return {
             enocean.utils.from_hex_string(telegram['rorg']): {
                 enocean.utils.from_hex_string(function['func']): {
-                    enocean.utils.from_hex_string(type['type'], ): type
+                    enocean.utils.from_hex_string(type['type'], ): self._compile_profile(type)
                     for type in function.find_all('profile')
                 }
                 for function in telegram.find_all('profiles')
@@ -48,166 +290,447 @@ class EEP(object):
         }
 
     @staticmethod
-    def _get_raw(source, bitarray):
-        ''' Get raw data as integer, based on offset and size '''
-        offset = int(source['offset'])
-        size = int(source['size'])
-        return int(''.join(['1' if digit else '0' for digit in bitarray[offset:offset + size]]), 2)
+    def _compile_profile(profile):
+        ''' Compile <profile> -tag of the XML to EEPProfile '''
+        command = profile.find('command', recursive=False)
+        return EEPProfile(
+            description=profile.get('description'),
+            command=EEP._compile_field(command) if command else None,
+            data=tuple(EEP._compile(data) for data in profile.find_all('data', recursive=False)),
+        )
 
     @staticmethod
-    def _set_raw(target, raw_value, bitarray):
-        ''' put value into bit array '''
-        offset = int(target['offset'])
-        size = int(target['size'])
-        for digit in range(size):
-            bitarray[offset+digit] = (raw_value >> (size-digit-1)) & 0x01 != 0
-        return bitarray
+    def _compile(data):
+        ''' Compile <data> -tag of the XML to EEPData '''
+        fields = tuple(
+            EEP._compile_field(source)
+            for source in data.contents
+            if source.name in ('value', 'enum', 'status')
+        )
+        shortcuts = {}
+        for field in fields:
+            shortcuts.setdefault(field.shortcut, field)
+        return EEPData(
+            fields=fields,
+            shortcuts=shortcuts,
+            bits=int(data.get('bits', 1)),
+            direction=data.get('direction'),
+            command=data.get('command'),
+        )
 
     @staticmethod
-    def _get_rangeitem(source, raw_value):
-        for rangeitem in source.find_all('rangeitem'):
-            if raw_value in range(int(rangeitem.get('start', -1)), int(rangeitem.get('end', -1)) + 1):
-                return rangeitem
+    def _compile_field(source):
+        ''' Compile <value>, <enum>, <status> or <command> -tag of the XML to EEPField '''
+        rng_min = rng_max = scl_min = scl_max = slope = None
+        items = OrderedDict()
+        values = {}
+        rangeitems = []
+        if source.name == 'value':
+            rng = source.find('range')
+            # Values without scale are reported as is
+            scl = source.find('scale') or rng
+            rng_min = float(rng.find('min').text)
+            rng_max = float(rng.find('max').text)
+            scl_min = float(scl.find('min').text)
+            scl_max = float(scl.find('max').text)
+            slope = (scl_max - scl_min) / (rng_max - rng_min)
+        if source.name in ('enum', 'command'):
+            for item in source.find_all('item'):
+                items.setdefault(int(item['value']), item['description'])
+                values.setdefault(item['description'], int(item['value']))
+            for rangeitem in source.find_all('rangeitem'):
+                rangeitems.append((
+                    int(rangeitem.get('start', -1)),
+                    int(rangeitem.get('end', -1)),
+                    rangeitem['description'],
+                ))
+        rangeitems = _interval_table(rangeitems)
+        return EEPField(
+            kind=source.name,
+            shortcut=source['shortcut'],
+            description=source.get('description'),
+            unit=source.get('unit', ''),
+            offset=int(source['offset']),
+            size=int(source.get('size', 1)),
+            range_min=rng_min,
+            range_max=rng_max,
+            scale_min=scl_min,
+            scale_max=scl_max,
+            slope=slope,
+            items=items,
+            labels=dict((raw_value, description.format(value=raw_value)) for raw_value, description in items.items()),
+            values=values,
+            rangeitems=rangeitems,
+            range_starts=tuple(start for start, _, _, _ in rangeitems),
+        )
 
-    def _get_value(self, source, bitarray):
-        ''' Get value, based on the data in XML '''
-        raw_value = self._get_raw(source, bitarray)
+    @staticmethod
+    def _get_raw(field, bitarray):
+        ''' Get raw data as integer, based on offset and size '''
+        if isinstance(bitarray, enocean.utils.BitView):
+            return bitarray.get(field.offset, field.size)
+        return enocean.utils.from_bitarray(bitarray[field.offset:field.offset + field.size])
 
-        rng = source.find('range')
-        rng_min = float(rng.find('min').text)
-        rng_max = float(rng.find('max').text)
+    @staticmethod
+    def _set_raw(field, raw_value, bitarray):
+        ''' put value into bit array '''
+        if isinstance(bitarray, enocean.utils.BitView):
+            bitarray.set(field.offset, field.size, raw_value)
+            return bitarray
+        for digit in range(field.size):
+            bitarray[field.offset+digit] = (raw_value >> (field.size-digit-1)) & 0x01 != 0
+        return bitarray
 
-        scl = source.find('scale')
-        scl_min = float(scl.find('min').text)
-        scl_max = float(scl.find('max').text)
+    @staticmethod
+    def _get_label(field, raw_value):
+        ''' Get description of enum value, formatted with the value. Returns None for unknown values. '''
+        label = field.labels.get(raw_value)
+        if label is not None:
+            return label
+        index = bisect.bisect_right(field.range_starts, raw_value) - 1
+        if index < 0:
+            return None
+        start, end, description, parts = field.rangeitems[index]
+        if raw_value > end:
+            return None
+        if parts is None:
+            return description.format(value=raw_value)
+        return str(raw_value).join(parts)
 
+    def _get_value(self, field, bitarray):
+        ''' Get value, based on the compiled field '''
+        raw_value = self._get_raw(field, bitarray)
         return {
-            source['shortcut']: {
-                'description': source.get('description'),
-                'unit': source['unit'],
-                'value': (scl_max - scl_min) / (rng_max - rng_min) * (raw_value - rng_min) + scl_min,
-                'raw_value': raw_value,
-            }
+            'description': field.description,
+            'unit': field.unit,
+            'value': field.slope * (raw_value - field.range_min) + field.scale_min,
+            'raw_value': raw_value,
         }
 
-    def _get_enum(self, source, bitarray):
-        ''' Get enum value, based on the data in XML '''
-        raw_value = self._get_raw(source, bitarray)
-
-        # Find value description.
-        value_desc = source.find('item', {'value': str(raw_value)}) or self._get_rangeitem(source, raw_value)
-
+    def _get_enum(self, field, bitarray):
+        ''' Get enum value, based on the compiled field '''
+        raw_value = self._get_raw(field, bitarray)
         return {
-            source['shortcut']: {
-                'description': source.get('description'),
-                'unit': source.get('unit', ''),
-                'value': value_desc['description'].format(value=raw_value),
-                'raw_value': raw_value,
-            }
+            'description': field.description,
+            'unit': field.unit,
+            'value': self._describe(field, raw_value),
+            'raw_value': raw_value,
         }
 
-    def _get_boolean(self, source, bitarray):
-        ''' Get boolean value, based on the data in XML '''
-        raw_value = self._get_raw(source, bitarray)
+    def _get_boolean(self, field, bitarray):
+        ''' Get boolean value, based on the compiled field '''
+        raw_value = self._get_raw(field, bitarray)
         return {
-            source['shortcut']: {
-                'description': source.get('description'),
-                'unit': source.get('unit', ''),
-                'value': True if raw_value else False,
-                'raw_value': raw_value,
-            }
+            'description': field.description,
+            'unit': field.unit,
+            'value': True if raw_value else False,
+            'raw_value': raw_value,
         }
 
-    def _set_value(self, target, value, bitarray):
+    def _set_value(self, field, value, bitarray):
         ''' set given numeric value to target field in bitarray '''
         # derive raw value
-        rng = target.find('range')
-        rng_min = float(rng.find('min').text)
-        rng_max = float(rng.find('max').text)
-        scl = target.find('scale')
-        scl_min = float(scl.find('min').text)
-        scl_max = float(scl.find('max').text)
-        raw_value = (value - scl_min) * (rng_max - rng_min) / (scl_max - scl_min) + rng_min
+        raw_value = (value - field.scale_min) * (field.range_max - field.range_min) \
+            / (field.scale_max - field.scale_min) + field.range_min
         # store value in bitfield
-        return self._set_raw(target, int(raw_value), bitarray)
+        return self._set_raw(field, int(raw_value), bitarray)
 
-    def _set_enum(self, target, value, bitarray):
+    def _set_enum(self, field, value, bitarray):
         ''' set given enum value (by string or integer value) to target field in bitarray '''
         # derive raw value
         if isinstance(value, int):
             # check whether this value exists
-            if target.find('item', {'value': value}) or self._get_rangeitem(target, value):
-                # set integer values directly
-                raw_value = value
-            else:
+            if self._get_label(field, value) is None:
                 raise ValueError('Enum value "%s" not found in EEP.' % (value))
+            # set integer values directly
+            raw_value = value
         else:
-            value_item = target.find('item', {'description': value})
-            if value_item is None:
+            raw_value = field.values.get(value)
+            if raw_value is None:
                 raise ValueError('Enum description for value "%s" not found in EEP.' % (value))
-            raw_value = int(value_item['value'])
-        return self._set_raw(target, raw_value, bitarray)
+        return self._set_raw(field, raw_value, bitarray)
 
     @staticmethod
-    def _set_boolean(target, data, bitarray):
+    def _set_boolean(field, data, bitarray):
         ''' set given value to target bit in bitarray '''
-        bitarray[int(target['offset'])] = data
+        bitarray[field.offset] = data
         return bitarray
 
     def find_profile(self, bitarray, eep_rorg, rorg_func, rorg_type, direction=None, command=None):
-        ''' Find profile and data description, matching RORG, FUNC and TYPE '''
+        '''
+        Find profile and data description, matching RORG, FUNC and TYPE.
+        If the profile defines commands and command isn't given, the command is read from bitarray
+        (if given), falling back to the first data description for unknown commands.
+        '''
         if not self.init_ok:
             self.logger.warn('EEP.xml not loaded!')
             return None
 
-        if eep_rorg not in self.telegrams.keys():
+        if command is None and bitarray is not None:
+            dispatch = self.command_table(eep_rorg, rorg_func, rorg_type, direction)
+            if dispatch is not None:
+                field, table = dispatch
+                try:
+                    data = table.get(self._get_raw(field, bitarray))
+                except IndexError:
+                    data = None
+                if data is not None:
+                    return data
+
+        key = (eep_rorg, rorg_func, rorg_type, direction, command)
+        if key in self._compiled:
+            return self._compiled[key]
+
+        telegram = self._section(eep_rorg)
+        if telegram is None:
             self.logger.warn('Cannot find rorg %s in EEP!', hex(eep_rorg))
             return None
 
-        if rorg_func not in self.telegrams[eep_rorg].keys():
+        if rorg_func not in telegram.keys():
             self.logger.warn('Cannot find rorg %s func %s in EEP!', hex(eep_rorg), hex(rorg_func))
             return None
 
-        if rorg_type not in self.telegrams[eep_rorg][rorg_func].keys():
-            self.logger.warn('Cannot find rorg %s func %s type %s in EEP!', hex(eep_rorg), hex(rorg_func), hex(rorg_type))
+        if rorg_type not in telegram[rorg_func].keys():
+            self.logger.warn('Cannot find rorg %s func %s type %s in EEP!',
+                             hex(eep_rorg), hex(rorg_func), hex(rorg_type))
             return None
 
-        profile = self.telegrams[eep_rorg][rorg_func][rorg_type]
+        profile = telegram[rorg_func][rorg_type]
 
         if command:
             # multiple commands can be defined, with the command id always in same location (per RORG-FUNC-TYPE).
-            eep_command = profile.find('command', recursive=False)
             # If commands are not set in EEP, or command is None,
             # get the first data as a "best guess".
-            if not eep_command:
-                return profile.find('data', recursive=False)
-
-            # If eep_command is defined, so should be data.command
-            return profile.find('data', {'command': str(command)}, recursive=False)
-
+            if profile.command is None:
+                data = profile.data[:1]
+            else:
+                # If eep_command is defined, so should be data.command
+                data = [data for data in profile.data if data.command == str(command)]
         # extract data description
         # the direction tag is optional
-        if direction is None:
-            return profile.find('data', recursive=False)
-        return profile.find('data', {'direction': direction}, recursive=False)
+        elif direction is None:
+            data = profile.data[:1]
+        else:
+            data = [data for data in profile.data if data.direction == str(direction)]
+
+        self._compiled[key] = data[0] if data else None
+        return self._compiled[key]
+
+    def command_table(self, eep_rorg, rorg_func, rorg_type, direction=None):
+        '''
+        Get the command dispatch table of the profile matching RORG, FUNC, TYPE and direction.
+        returns:
+            - (command field, {command: data description}), None if the profile doesn't define commands
+        '''
+        key = (eep_rorg, rorg_func, rorg_type, direction)
+        if key not in self._commands:
+            telegram = self._section(eep_rorg) or {}
+            profile = telegram.get(rorg_func, {}).get(rorg_type)
+            if profile is None or profile.command is None:
+                self._commands[key] = None
+            else:
+                table = {}
+                for data in profile.data:
+                    if data.command is not None and (direction is None or data.direction == str(direction)):
+                        table.setdefault(int(data.command), data)
+                self._commands[key] = (profile.command, table)
+        return self._commands[key]
 
-    def get_values(self, profile, bitarray, status):
-        ''' Get keys and values from bitarray '''
+    @staticmethod
+    def _generate_decoder(profile, record=None, fields=None):
+        '''
+        Generate function decoding the fields of the profile with straight-line code.
+        The function takes data and status as BitView, and returns the values
+        in the same format as get_values(), or as instance of record (see record_class()).
+        If fields (shortcuts) is given, only these fields are decoded. Records always contain all the fields.
+        '''
+        if fields is None or record is not None:
+            fields = profile.fields
+        else:
+            fields = tuple(field for field in profile.fields if field.shortcut in fields)
+        namespace = {
+            'OrderedDict': OrderedDict,
+            'describe': EEP._describe,
+            'new': tuple.__new__,
+            'record': record,
+        }
+        lines = [
+            'def decode(bitarray, status):',
+            '    data = bitarray.value',
+            '    width = bitarray.width',
+            '    status_data = status.value',
+            '    status_width = status.width',
+        ]
+        # Check the lengths once, instead of for each field
+        data_end = max([field.offset + field.size for field in fields if field.kind != 'status'] or [0])
+        status_end = max([field.offset + field.size for field in fields if field.kind == 'status'] or [0])
+        lines.append('    if width < %d or status_width < %d:' % (data_end, status_end))
+        lines.append('        raise IndexError(\'Bit field out of range\')')
+
+        for i, field in enumerate(fields):
+            namespace['field_%d' % i] = field
+            source, width = ('status_data', 'status_width') if field.kind == 'status' else ('data', 'width')
+            lines.append('    raw_%d = (%s >> (%s - %d)) & 0x%X' % (
+                i, source, width, field.offset + field.size, (1 << field.size) - 1))
+
+            if field.kind == 'value':
+                namespace['slope_%d' % i] = field.slope
+                namespace['range_min_%d' % i] = field.range_min
+                namespace['scale_min_%d' % i] = field.scale_min
+                lines.append('    value_%d = slope_%d * (raw_%d - range_min_%d) + scale_min_%d' % (i, i, i, i, i))
+            elif field.kind == 'enum':
+                namespace['labels_%d' % i] = field.labels
+                lines.append('    value_%d = labels_%d.get(raw_%d)' % (i, i, i))
+                lines.append('    if value_%d is None:' % i)
+                lines.append('        value_%d = describe(field_%d, raw_%d)' % (i, i, i))
+            else:
+                lines.append('    value_%d = raw_%d != 0' % (i, i))
+
+        if record is not None:
+            # Values first, then the raw values, see EEPRecord
+            lines.append('    return new(record, (%s))' % ''.join(
+                ['value_%d, ' % i for i in range(len(fields))] +
+                ['raw_%d, ' % i for i in range(len(fields))]))
+        else:
+            lines.append('    output = OrderedDict()')
+            for i, field in enumerate(fields):
+                namespace['shortcut_%d' % i] = field.shortcut
+                namespace['description_%d' % i] = field.description
+                namespace['unit_%d' % i] = field.unit
+                lines.append(
+                    '    output[shortcut_%d] = {\'description\': description_%d, \'unit\': unit_%d, '
+                    '\'value\': value_%d, \'raw_value\': raw_%d}' % (i, i, i, i, i))
+            lines.append('    return output')
+
+        code = compile('\n'.join(lines) + '\n', '<EEP decoder>', 'exec')
+        exec(code, namespace)
+        return namespace['decode']
+
+    @staticmethod
+    def _generate_record(profile):
+        ''' Generate EEPRecord subclass for the profile '''
+        shortcuts = tuple(field.shortcut for field in profile.fields)
+        # Attribute names for the values and raw values, with the shortcuts made valid identifiers
+        names = []
+        for shortcut in shortcuts:
+            name = re.sub(r'\W+', '_', shortcut).strip('_')
+            if not name or not name[0].isalpha():
+                name = 'F' + name
+            while name in names or name.endswith('_raw'):
+                name += '_'
+            names.append(name)
+        names += [name + '_raw' for name in names]
+
+        base = namedtuple('Record', names)
+        return type(str('Record'), (base, EEPRecord), {
+            '__slots__': (),
+            'profile': profile,
+            'shortcuts': shortcuts,
+            'descriptions': dict((field.shortcut, field.description) for field in profile.fields),
+            'units': dict((field.shortcut, field.unit) for field in profile.fields),
+            '_index': dict((shortcut, i) for i, shortcut in enumerate(shortcuts)),
+        })
+
+    @staticmethod
+    def _describe(field, raw_value):
+        ''' Get description of enum value, formatted with the value. Raises ValueError for unknown values. '''
+        label = EEP._get_label(field, raw_value)
+        if label is None:
+            raise ValueError('Enum value "%s" not found in EEP.' % (raw_value))
+        return label
+
+    def _decoder(self, profile, record=False, fields=None):
+        ''' Get generated decoder for compiled profile, decoding only fields (shortcuts) if given '''
+        key = (id(profile), record, fields)
+        cached = self._decoders.get(key)
+        # Compare the profile too, as the id() may be reused for another object
+        if cached is None or cached[0] is not profile:
+            if record:
+                record_class = self._generate_record(profile)
+                decoder = self._generate_decoder(profile, record_class)
+                decoder.record_class = record_class
+            else:
+                for shortcut in fields or ():
+                    if shortcut not in profile.shortcuts:
+                        self.logger.warning('Cannot find data description for shortcut %s', shortcut)
+                decoder = self._generate_decoder(profile, fields=fields)
+            cached = (profile, decoder)
+            self._decoders[key] = cached
+        return cached[1]
+
+    def decoder_for(self, eep_rorg, rorg_func, rorg_type, direction=None, command=None, record=False, fields=None):
+        '''
+        Get decoder function for profile matching RORG, FUNC, TYPE, direction and command.
+        The function is called with data and status as BitView (see Packet._bit_data and Packet._bit_status)
+        and returns an OrderedDict of the values, like get_values().
+        If fields (shortcuts) is given, the function decodes only these fields.
+        If record is set, the function returns an EEPRecord instead, see record_class().
+        returns None, if the profile isn't found.
+        '''
+        profile = self.find_profile(None, eep_rorg, rorg_func, rorg_type, direction, command)
+        if profile is None:
+            return None
+        return self._decoder(profile, record, _projection(fields))
+
+    def record_class(self, profile):
+        ''' Get the EEPRecord subclass, which the record decoder of the compiled profile returns '''
+        return self._decoder(profile, record=True).record_class
+
+    def get_record(self, profile, bitarray, status):
+        ''' Get values from bitarray and status (as BitView) as EEPRecord, None if profile is None '''
+        if not self.init_ok or profile is None:
+            return None
+        return self._decoder(profile, record=True)(bitarray, status)
+
+    def decode_batch(self, profile_key, payloads, status=None, fields=None):
+        '''
+        Decode telegrams of the same profile to columns of NumPy arrays.
+        profile_key is (RORG, FUNC, TYPE), optionally followed by direction and command.
+        payloads is a 2D uint8 array (or list of bytes) of the data bytes, one row per telegram.
+        If fields (shortcuts) is given, only these fields are decoded.
+        Requires NumPy, see enocean.protocol.bulk.decode_profile() for the details.
+        '''
+        profile = self.find_profile(None, *profile_key)
+        if profile is None:
+            raise ValueError('Profile %s not found in EEP.' % (enocean.utils.to_hex_string(list(profile_key[:3]))))
+        from enocean.protocol import bulk
+        return bulk.decode_profile(profile, payloads, status, _projection(fields))
+
+    def get_values(self, profile, bitarray, status, fields=None):
+        ''' Get keys and values from bitarray, only of fields (shortcuts) if given '''
         if not self.init_ok or profile is None:
             return [], {}
 
+        fields = _projection(fields)
+        if isinstance(bitarray, enocean.utils.BitView) and isinstance(status, enocean.utils.BitView):
+            if self.cache is not None:
+                output = self.cache.decode(self._decoder(profile, fields=fields), profile, bitarray, status, fields)
+            else:
+                output = self._decoder(profile, fields=fields)(bitarray, status)
+            return output.keys(), output
+
         output = OrderedDict({})
-        for source in profile.contents:
-            if not source.name:
+        for field in profile.fields:
+            if fields is not None and field.shortcut not in fields:
                 continue
-            if source.name == 'value':
-                output.update(self._get_value(source, bitarray))
-            if source.name == 'enum':
-                output.update(self._get_enum(source, bitarray))
-            if source.name == 'status':
-                output.update(self._get_boolean(source, status))
+            if field.kind == 'value':
+                output[field.shortcut] = self._get_value(field, bitarray)
+            if field.kind == 'enum':
+                output[field.shortcut] = self._get_enum(field, bitarray)
+            if field.kind == 'status':
+                output[field.shortcut] = self._get_boolean(field, status)
         return output.keys(), output
 
+    def check_values(self, profile, bitarray):
+        ''' Raise ValueError, if an enum field of bitarray has a value the profile doesn't define '''
+        if not self.init_ok or profile is None:
+            return
+        for field in profile.fields:
+            if field.kind == 'enum':
+                raw_value = self._get_raw(field, bitarray)
+                if self._get_label(field, raw_value) is None:
+                    raise ValueError('Enum value "%s" of %s not found in EEP.' % (raw_value, field.shortcut))
+
     def set_values(self, profile, data, status, properties):
         ''' Update data based on data contained in properties '''
         if not self.init_ok or profile is None:
@@ -215,17 +738,17 @@ class EEP(object):
 
         for shortcut, value in properties.items():
             # find the given property from EEP
-            target = profile.find(shortcut=shortcut)
+            target = profile.shortcuts.get(shortcut)
             if not target:
                 # TODO: Should we raise an error?
                 self.logger.warning('Cannot find data description for shortcut %s', shortcut)
                 continue
 
             # update bit_data
-            if target.name == 'value':
+            if target.kind == 'value':
                 data = self._set_value(target, value, data)
-            if target.name == 'enum':
+            if target.kind == 'enum':
                 data = self._set_enum(target, value, data)
-            if target.name == 'status':
+            if target.kind == 'status':
                 status = self._set_boolean(target, value, status)
         return data, status
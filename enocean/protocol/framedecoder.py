@@ -0,0 +1,95 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+import logging
+
+from enocean.protocol import crc8
+
+SYNC_BYTE = b'\x55'
+# Sync byte, data length (2 bytes), optional length, packet type and header CRC
+HEADER_LENGTH = 6
+
+
+class FrameDecoder(object):
+    '''
+    Incremental decoder for ESP3 frames.
+
+    Received bytes are passed to feed(), which returns the complete, CRC checked
+    frames found so far as memoryviews into the decoder buffer.
+    The buffer is scanned once and compacted once per feed(), so decoding a burst
+    of N frames is linear in the amount of data received.
+
+    The header CRC is checked before the length fields are trusted. If it fails,
+    the search for the next frame resumes from the byte following the sync byte,
+    so a corrupted header can't swallow the frames following it.
+    '''
+    logger = logging.getLogger('enocean.protocol.framedecoder')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        # Number of frames dropped due to CRC errors
+        self.crc_errors = 0
+        # Number of bytes discarded while searching for valid frames
+        self.skipped = 0
+
+    def feed(self, chunk=None):
+        '''
+        Appends chunk to the buffer and decodes all complete frames from it.
+        returns:
+            - list of memoryviews, each containing a complete frame (sync byte to data CRC)
+        '''
+        if chunk:
+            self.buffer.extend(chunk)
+
+        buf = self.buffer
+        length = len(buf)
+        view = memoryview(buf)
+        frames = []
+        skipped = 0
+        position = 0
+        while True:
+            start = buf.find(SYNC_BYTE, position)
+            # If the buffer doesn't contain 0x55 (start char), the remaining bytes aren't needed.
+            if start == -1:
+                skipped += length - position
+                position = length
+                break
+            skipped += start - position
+            position = start
+            # Header not yet received completely
+            if start + HEADER_LENGTH > length:
+                break
+
+            # Check header CRC before trusting the length fields.
+            # On failure, the sync byte was either corrupted or not a sync byte at all,
+            # so continue searching from the next byte.
+            if buf[start + 5] != crc8.calc(view[start + 1:start + 5]):
+                self.logger.debug('Header CRC error, resynchronizing.')
+                self.crc_errors += 1
+                skipped += 1
+                position = start + 1
+                continue
+
+            data_len = (buf[start + 1] << 8) | buf[start + 2]
+            opt_len = buf[start + 3]
+            # Header: 6 bytes, data, optional data and data checksum
+            end = start + HEADER_LENGTH + data_len + opt_len + 1
+            if end > length:
+                break
+            position = end
+
+            if buf[end - 1] != crc8.calc(view[start + HEADER_LENGTH:end - 1]):
+                self.logger.error('Data CRC error!')
+                self.crc_errors += 1
+                skipped += end - start
+                continue
+            frames.append(view[start:end])
+
+        if skipped:
+            self.logger.debug('Skipped %d bytes while searching for frames.', skipped)
+            self.skipped += skipped
+
+        # Compact the buffer once. The returned frames keep the old buffer alive,
+        # so a new buffer is allocated for the remaining bytes.
+        if position:
+            self.buffer = buf[position:]
+        return frames
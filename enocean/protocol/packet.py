@@ -9,39 +9,103 @@ from enocean.protocol.eep import EEP
 from enocean.protocol.constants import PACKET, RORG, PARSE_RESULT, DB0, DB2, DB3, DB4, DB6
 
 
+class _Unset(object):
+    ''' Type of _UNSET, which stays the same object when packets are pickled or copied '''
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_UNSET'
+
+    def __repr__(self):
+        return '_UNSET'
+
+
+# Marker for lazy attributes, which haven't been parsed (or set) yet.
+_UNSET = _Unset()
+
+# RORGs with status in the last byte of data
+_STATUS_IN_DATA = frozenset([RORG.RPS, RORG.BS1, RORG.BS4])
+
+
+class LazyAttribute(object):
+    '''
+    Packet attribute, which is parsed only on first access.
+    The value is parsed by the loader -method of the packet, which returns a dictionary
+    of values for all the attributes it parses. The values are cached on the packet,
+    values of attributes already set are retained.
+    '''
+    def __init__(self, name, loader, resets=()):
+        self.name = name
+        self.attribute = '_' + name
+        self.loader = loader
+        # Attributes derived from this one, which are reset when the value is set.
+        self.resets = tuple('_' + name for name in resets)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self.attribute, _UNSET)
+        if value is _UNSET:
+            for name, value in getattr(instance, self.loader)().items():
+                if getattr(instance, '_' + name, _UNSET) is _UNSET:
+                    setattr(instance, '_' + name, value)
+            value = getattr(instance, self.attribute)
+        return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.attribute, value)
+        for attribute in self.resets:
+            setattr(instance, attribute, _UNSET)
+
+
 class Packet(object):
     '''
     Base class for Packet.
     Mainly used for for packet generation and
     Packet.parse_msg(buf) for parsing message.
     parse_msg() returns subclass, if one is defined for the data type.
+
+    To keep the memory footprint small, packets use __slots__ and received data
+    is stored as bytes, until data or optional is accessed (and possibly modified) as list.
     '''
+    __slots__ = (
+        'packet_type', 'rorg', '_rorg_func', '_rorg_type', '_rorg_manufacturer', 'received',
+        '_data', '_optional', 'status', '_parsed', 'repeater_count', '_profile',
+    )
     eep = EEP()
     logger = logging.getLogger('enocean.protocol.packet')
 
+    # Parsed from teach-in telegrams, or set by select_eep()
+    rorg_func = LazyAttribute('rorg_func', '_parse_teach_in')
+    rorg_type = LazyAttribute('rorg_type', '_parse_teach_in')
+    rorg_manufacturer = LazyAttribute('rorg_manufacturer', '_parse_teach_in')
+    # Cached values of lazy attributes, reset by parse()
+    _lazy_attributes = ('_rorg_func', '_rorg_type', '_rorg_manufacturer')
+
     def __init__(self, packet_type, data=None, optional=None):
         self.packet_type = packet_type
         self.rorg = RORG.UNDEFINED
-        self.rorg_func = None
-        self.rorg_type = None
-        self.rorg_manufacturer = None
 
         self.received = None
 
-        if not isinstance(data, list) or data is None:
+        if isinstance(data, (bytes, bytearray)):
+            self._data = bytes(data)
+        elif not isinstance(data, list) or data is None:
             self.logger.warning('Replacing Packet.data with default value.')
-            self.data = []
+            self._data = []
         else:
-            self.data = data
+            self._data = data
 
-        if not isinstance(optional, list) or optional is None:
+        if isinstance(optional, (bytes, bytearray)):
+            self._optional = bytes(optional)
+        elif not isinstance(optional, list) or optional is None:
             self.logger.warning('Replacing Packet.optional with default value.')
-            self.optional = []
+            self._optional = []
         else:
-            self.optional = optional
+            self._optional = optional
 
         self.status = 0
-        self.parsed = OrderedDict({})
+        self._parsed = None
         self.repeater_count = 0
         self._profile = None
 
@@ -50,8 +114,8 @@ class Packet(object):
     def __str__(self):
         return '0x%02X %s %s %s' % (
             self.packet_type,
-            [hex(o) for o in self.data],
-            [hex(o) for o in self.optional],
+            [hex(o) for o in self._data],
+            [hex(o) for o in self._optional],
             self.parsed)
 
     def __unicode__(self):
@@ -59,7 +123,46 @@ class Packet(object):
 
     def __eq__(self, other):
         return self.packet_type == other.packet_type and self.rorg == other.rorg \
-            and self.data == other.data and self.optional == other.optional
+            and bytearray(self._data) == bytearray(other._data) \
+            and bytearray(self._optional) == bytearray(other._optional)
+
+    @property
+    def data(self):
+        ''' Data as list of integers '''
+        # Received data is kept as bytes, until it's accessed as list.
+        if not isinstance(self._data, list):
+            self._data = list(self._data)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def optional(self):
+        ''' Optional data as list of integers '''
+        if not isinstance(self._optional, list):
+            self._optional = list(self._optional)
+        return self._optional
+
+    @optional.setter
+    def optional(self, value):
+        self._optional = value
+
+    @property
+    def parsed(self):
+        ''' Values parsed by parse_eep(), created on first access '''
+        if self._parsed is None:
+            self._parsed = OrderedDict()
+        elif self._parsed is _UNSET:
+            # Values of created packets are parsed on first access, see create()
+            self._parsed = OrderedDict()
+            self.parse_eep()
+        return self._parsed
+
+    @parsed.setter
+    def parsed(self, value):
+        self._parsed = value
 
     @property
     def _bit_data(self):
@@ -69,13 +172,15 @@ class Packet(object):
         # Packet.data would then only have the actual, documented data-bytes.
         # Packet.message would contain the whole message.
         # See discussion in issue #14
-        return enocean.utils.to_bitarray(self.data[1:len(self.data) - 5], (len(self.data) - 6) * 8)
+        return enocean.utils.BitView(self._data[1:len(self._data) - 5], (len(self._data) - 6) * 8)
 
     @_bit_data.setter
     def _bit_data(self, value):
         # The same as getting the data, first and last 5 bits are ommitted, as they are defined...
-        for byte in range(len(self.data) - 6):
-            self.data[byte+1] = enocean.utils.from_bitarray(value[byte*8:(byte+1)*8])
+        if not isinstance(value, enocean.utils.BitView):
+            value = enocean.utils.BitView(enocean.utils.from_bitarray(value), len(value))
+        data = self.data
+        data[1:len(data) - 5] = list(value.to_bytes())
 
     # # COMMENTED OUT, AS NOTHING TOUCHES _bit_optional FOR NOW.
     # # Thus, this is also untested.
@@ -93,7 +198,7 @@ class Packet(object):
 
     @property
     def _bit_status(self):
-        return enocean.utils.to_bitarray(self.status)
+        return enocean.utils.BitView(self.status, 8)
 
     @_bit_status.setter
     def _bit_status(self, value):
@@ -119,10 +224,18 @@ class Packet(object):
         try:
             data_len = (buf[1] << 8) | buf[2]
             opt_len = buf[3]
+            header_crc = buf[5]
         except IndexError:
             # If the fields don't exist, message is incomplete
             return PARSE_RESULT.INCOMPLETE, buf, None
 
+        # Check header CRC before trusting the length fields.
+        if header_crc != crc8.calc(buf[1:5]):
+            Packet.logger.error('Header CRC error!')
+            # Continue searching for the next message after the sync byte,
+            # instead of skipping the length of the (corrupted) message.
+            return PARSE_RESULT.CRC_MISMATCH, buf[1:], None
+
         # Header: 6 bytes, data, optional data and data checksum
         msg_len = 6 + data_len + opt_len + 1
         if len(buf) < msg_len:
@@ -136,12 +249,7 @@ class Packet(object):
         data = msg[6:6 + data_len]
         opt_data = msg[6 + data_len:6 + data_len + opt_len]
 
-        # Check CRCs for header and data
-        if msg[5] != crc8.calc(msg[1:5]):
-            # Fail if doesn't match message
-            Packet.logger.error('Header CRC error!')
-            # Return CRC_MISMATCH
-            return PARSE_RESULT.CRC_MISMATCH, buf, None
+        # Check CRC for data
         if msg[6 + data_len + opt_len] != crc8.calc(msg[6:6 + data_len + opt_len]):
             # Fail if doesn't match message
             Packet.logger.error('Data CRC error!')
@@ -149,20 +257,37 @@ class Packet(object):
             return PARSE_RESULT.CRC_MISMATCH, buf, None
 
         # If we got this far, everything went ok (?)
+        return PARSE_RESULT.OK, buf, Packet._create_packet(packet_type, data, opt_data)
+
+    @staticmethod
+    def parse_frame(frame):
+        '''
+        Creates Packet -object from a complete ESP3 frame,
+        as returned by enocean.protocol.framedecoder.FrameDecoder.
+        The frame (bytes, bytearray or memoryview) is expected to have valid CRCs.
+        returns:
+            - Packet -object
+        '''
+        data_len = (frame[1] << 8) | frame[2]
+        opt_len = frame[3]
+        return Packet._create_packet(
+            frame[4],
+            bytes(frame[6:6 + data_len]),
+            bytes(frame[6 + data_len:6 + data_len + opt_len]))
+
+    @staticmethod
+    def _create_packet(packet_type, data, opt_data):
+        ''' Creates Packet -object of the correct subclass for the packet type '''
         if packet_type == PACKET.RADIO_ERP1:
             # Need to handle UTE Teach-in here, as it's a separate packet type...
             if data[0] == RORG.UTE:
-                packet = UTETeachInPacket(packet_type, data, opt_data)
-            else:
-                packet = RadioPacket(packet_type, data, opt_data)
-        elif packet_type == PACKET.RESPONSE:
-            packet = ResponsePacket(packet_type, data, opt_data)
-        elif packet_type == PACKET.EVENT:
-            packet = EventPacket(packet_type, data, opt_data)
-        else:
-            packet = Packet(packet_type, data, opt_data)
-
-        return PARSE_RESULT.OK, buf, packet
+                return UTETeachInPacket(packet_type, data, opt_data)
+            return RadioPacket(packet_type, data, opt_data)
+        if packet_type == PACKET.RESPONSE:
+            return ResponsePacket(packet_type, data, opt_data)
+        if packet_type == PACKET.EVENT:
+            return EventPacket(packet_type, data, opt_data)
+        return Packet(packet_type, data, opt_data)
 
     @staticmethod
     def create(packet_type, rorg, rorg_func, rorg_type, direction=None, command=None,
@@ -208,57 +333,71 @@ class Packet(object):
         if not isinstance(sender, list) or len(sender) != 4:
             raise ValueError('Sender must a list containing 4 (numeric) values.')
 
-        packet = Packet(packet_type, data=[], optional=[])
-        packet.rorg = rorg
-        packet.data = [packet.rorg]
-        # Select EEP at this point, so we know how many bits we're dealing with (for VLD).
-        packet.select_eep(rorg_func, rorg_type, direction, command)
+        profile = Packet.eep.find_profile(None, rorg, rorg_func, rorg_type, direction, command)
 
         # Initialize data depending on the profile.
         if rorg in [RORG.RPS, RORG.BS1]:
-            packet.data.extend([0])
+            length = 1
         elif rorg == RORG.BS4:
-            packet.data.extend([0, 0, 0, 0])
+            length = 4
         else:
-            packet.data.extend([0] * int(packet._profile.get('bits', '1')))
-        packet.data.extend(sender)
-        packet.data.extend([0])
-        # Always use sub-telegram 3, maximum dbm (as per spec, when sending),
-        # and no security (security not supported as per EnOcean Serial Protocol).
-        packet.optional = [3] + destination + [0xFF] + [0]
+            length = profile.bits
 
         if command:
             # Set CMD to command, if applicable.. Helps with VLD.
             kwargs['CMD'] = command
 
-        packet.set_eep(kwargs)
+        # Write the values straight into the payload, instead of building and parsing the packet.
+        bit_data, bit_status = Packet.eep.set_values(
+            profile, enocean.utils.BitView(0, length * 8), enocean.utils.BitView(0, 8), kwargs)
+        # Packet.parsed is decoded later, so fail now for enum fields left to undefined values.
+        Packet.eep.check_values(profile, bit_data)
+        payload = list(bit_data.to_bytes())
         if rorg in [RORG.BS1, RORG.BS4] and not learn:
-            if rorg == RORG.BS1:
-                packet.data[1] |= (1 << 3)
-            if rorg == RORG.BS4:
-                packet.data[4] |= (1 << 3)
-        packet.data[-1] = packet.status
-
-        # Parse the built packet, so it corresponds to the received packages
-        # For example, stuff like RadioPacket.learn should be set.
-        packet = Packet.parse_msg(packet.build())[2]
-        packet.rorg = rorg
-        packet.parse_eep(rorg_func, rorg_type, direction, command)
+            # Learn bit is DB0.BIT_3, in the last byte of the payload
+            payload[-1] |= (1 << 3)
+
+        # Always use sub-telegram 3, maximum dbm (as per spec, when sending),
+        # and no security (security not supported as per EnOcean Serial Protocol).
+        packet = RadioPacket(
+            packet_type,
+            data=[rorg] + payload + list(sender) + [int(bit_status)],
+            optional=[3] + destination + [0xFF] + [0])
+        packet.sender = list(sender)
+        packet.destination = list(destination)
+        packet.select_eep(rorg_func, rorg_type, direction, command)
+        # Packet.parsed is decoded from the payload on first access, so it corresponds to the received packets.
+        packet._parsed = _UNSET
         return packet
 
     def parse(self):
-        ''' Parse data from Packet '''
-        # Parse status from messages
-        if self.rorg in [RORG.RPS, RORG.BS1, RORG.BS4]:
-            self.status = self.data[-1]
-        if self.rorg == RORG.VLD:
-            self.status = self.optional[-1]
+        '''
+        Parse data from Packet.
+        Only status is parsed here, the lazy attributes are parsed on first access.
+        '''
+        for attribute in self._lazy_attributes:
+            setattr(self, attribute, _UNSET)
 
-        if self.rorg in [RORG.RPS, RORG.BS1, RORG.BS4]:
+        # Parse status from messages
+        if self.rorg in _STATUS_IN_DATA:
+            self.status = self._data[-1]
             # These message types should have repeater count in the last for bits of status.
-            self.repeater_count = enocean.utils.from_bitarray(self._bit_status[4:])
+            self.repeater_count = self.status & 0x0F
+        if self.rorg == RORG.VLD:
+            self.status = self._optional[-1]
+        # Avoid creating Packet.parsed, until values are parsed to it.
+        if self._parsed is None:
+            return OrderedDict()
         return self.parsed
 
+    def _parse_teach_in(self):
+        ''' Loader for the teach-in related lazy attributes '''
+        return {
+            'rorg_func': None,
+            'rorg_type': None,
+            'rorg_manufacturer': None,
+        }
+
     def select_eep(self, rorg_func, rorg_type, direction=None, command=None):
         ''' Set EEP based on FUNC and TYPE '''
         # set EEP profile
@@ -267,37 +406,55 @@ class Packet(object):
         self._profile = self.eep.find_profile(self._bit_data, self.rorg, rorg_func, rorg_type, direction, command)
         return self._profile is not None
 
-    def parse_eep(self, rorg_func=None, rorg_type=None, direction=None, command=None):
-        ''' Parse EEP based on FUNC and TYPE '''
+    def parse_eep(self, rorg_func=None, rorg_type=None, direction=None, command=None, fields=None):
+        ''' Parse EEP based on FUNC and TYPE, only the fields (shortcuts) in fields if given '''
         # set EEP profile, if demanded
         if rorg_func is not None and rorg_type is not None:
             self.select_eep(rorg_func, rorg_type, direction, command)
         # parse data
-        provides, values = self.eep.get_values(self._profile, self._bit_data, self._bit_status)
+        provides, values = self.eep.get_values(self._profile, self._bit_data, self._bit_status, fields)
         self.parsed.update(values)
         return list(provides)
 
+    def parse_record(self, rorg_func=None, rorg_type=None, direction=None, command=None):
+        '''
+        Parse EEP based on FUNC and TYPE to a record (see EEP.record_class()), without updating Packet.parsed.
+        returns None, if the EEP isn't found.
+        '''
+        # set EEP profile, if demanded
+        if rorg_func is not None and rorg_type is not None:
+            self.select_eep(rorg_func, rorg_type, direction, command)
+        return self.eep.get_record(self._profile, self._bit_data, self._bit_status)
+
     def set_eep(self, data):
         ''' Update packet data based on EEP. Input data is a dictionary with keys corresponding to the EEP. '''
         self._bit_data, self._bit_status = self.eep.set_values(self._profile, self._bit_data, self._bit_status, data)
 
     def build(self):
         ''' Build Packet for sending to EnOcean controller '''
-        data_length = len(self.data)
-        ords = [0x55, (data_length >> 8) & 0xFF, data_length & 0xFF, len(self.optional), int(self.packet_type)]
+        data_length = len(self._data)
+        ords = [0x55, (data_length >> 8) & 0xFF, data_length & 0xFF, len(self._optional), int(self.packet_type)]
         ords.append(crc8.calc(ords[1:5]))
-        ords.extend(self.data)
-        ords.extend(self.optional)
+        ords.extend(self._data)
+        ords.extend(self._optional)
         ords.append(crc8.calc(ords[6:]))
         return ords
 
 
 class RadioPacket(Packet):
-    destination = [0xFF, 0xFF, 0xFF, 0xFF]
-    dBm = 0
-    sender = [0xFF, 0xFF, 0xFF, 0xFF]
-    learn = True
-    contains_eep = False
+    __slots__ = (
+        '_destination', '_dBm', '_sender', '_learn', '_contains_eep', '_sender_int', '_destination_int',
+    )
+    destination = LazyAttribute('destination', '_parse_addresses', resets=['destination_int'])
+    dBm = LazyAttribute('dBm', '_parse_addresses')
+    sender = LazyAttribute('sender', '_parse_addresses', resets=['sender_int'])
+    learn = LazyAttribute('learn', '_parse_teach_in')
+    contains_eep = LazyAttribute('contains_eep', '_parse_teach_in')
+    # Cached integer addresses
+    sender_int = LazyAttribute('sender_int', '_parse_address_ints')
+    destination_int = LazyAttribute('destination_int', '_parse_address_ints')
+    _lazy_attributes = Packet._lazy_attributes + (
+        '_destination', '_dBm', '_sender', '_learn', '_contains_eep', '_sender_int', '_destination_int')
 
     def __str__(self):
         packet_str = super(RadioPacket, self).__str__()
@@ -309,46 +466,61 @@ class RadioPacket(Packet):
         return Packet.create(PACKET.RADIO_ERP1, rorg, rorg_func, rorg_type,
                              direction, command, destination, sender, learn, **kwargs)
 
-    @property
-    def sender_int(self):
-        return enocean.utils.combine_hex(self.sender)
-
     @property
     def sender_hex(self):
         return enocean.utils.to_hex_string(self.sender)
 
-    @property
-    def destination_int(self):
-        return enocean.utils.combine_hex(self.destination)
-
     @property
     def destination_hex(self):
         return enocean.utils.to_hex_string(self.destination)
 
     def parse(self):
-        self.destination = self.optional[1:5]
-        self.dBm = -self.optional[5]
-        self.sender = self.data[-5:-1]
-        # Default to learn == True, as some devices don't have a learn button
-        self.learn = True
+        self.rorg = self._data[0]
+        return super(RadioPacket, self).parse()
 
-        self.rorg = self.data[0]
+    def _parse_addresses(self):
+        ''' Loader for sender, destination and dBm '''
+        if len(self._optional) < 6:
+            return {
+                'destination': [0xFF, 0xFF, 0xFF, 0xFF],
+                'dBm': 0,
+                'sender': list(self._data[-5:-1]),
+            }
+        return {
+            'destination': list(self._optional[1:5]),
+            'dBm': -self._optional[5],
+            'sender': list(self._data[-5:-1]),
+        }
+
+    def _parse_address_ints(self):
+        ''' Loader for sender_int and destination_int '''
+        return {
+            'sender_int': enocean.utils.combine_hex(self.sender),
+            'destination_int': enocean.utils.combine_hex(self.destination),
+        }
+
+    def _parse_teach_in(self):
+        ''' Loader for learn, contains_eep and the EEP of teach-in telegrams '''
+        values = super(RadioPacket, self)._parse_teach_in()
+        # Default to learn == True, as some devices don't have a learn button
+        values['learn'] = True
+        values['contains_eep'] = False
 
         # parse learn bit and FUNC/TYPE, if applicable
         if self.rorg == RORG.BS1:
-            self.learn = not self._bit_data[DB0.BIT_3]
+            values['learn'] = not self._bit_data.get(DB0.BIT_3)
         if self.rorg == RORG.BS4:
-            self.learn = not self._bit_data[DB0.BIT_3]
-            if self.learn:
-                self.contains_eep = self._bit_data[DB0.BIT_7]
-                if self.contains_eep:
+            bit_data = self._bit_data
+            values['learn'] = not bit_data.get(DB0.BIT_3)
+            if values['learn']:
+                values['contains_eep'] = bit_data.get(DB0.BIT_7) == 1
+                if values['contains_eep']:
                     # Get rorg_func and rorg_type from an unidirectional learn packet
-                    self.rorg_func = enocean.utils.from_bitarray(self._bit_data[DB3.BIT_7:DB3.BIT_1])
-                    self.rorg_type = enocean.utils.from_bitarray(self._bit_data[DB3.BIT_1:DB2.BIT_2])
-                    self.rorg_manufacturer = enocean.utils.from_bitarray(self._bit_data[DB2.BIT_2:DB0.BIT_7])
-                    self.logger.debug('learn received, EEP detected, RORG: 0x%02X, FUNC: 0x%02X, TYPE: 0x%02X, Manufacturer: 0x%02X' % (self.rorg, self.rorg_func, self.rorg_type, self.rorg_manufacturer))  # noqa: E501
-
-        return super(RadioPacket, self).parse()
+                    values['rorg_func'] = bit_data.get(DB3.BIT_7, 6)
+                    values['rorg_type'] = bit_data.get(DB3.BIT_1, 7)
+                    values['rorg_manufacturer'] = bit_data.get(DB2.BIT_2, 11)
+                    self.logger.debug('learn received, EEP detected, RORG: 0x%02X, FUNC: 0x%02X, TYPE: 0x%02X, Manufacturer: 0x%02X' % (self.rorg, values['rorg_func'], values['rorg_type'], values['rorg_manufacturer']))  # noqa: E501
+        return values
 
 
 class UTETeachInPacket(RadioPacket):
@@ -363,14 +535,15 @@ class UTETeachInPacket(RadioPacket):
     DELETE_ACCEPTED = [True, False]
     EEP_NOT_SUPPORTED = [True, True]
 
-    unidirectional = False
-    response_expected = False
+    __slots__ = ('_unidirectional', '_response_expected', '_rorg_of_eep', '_request_type', '_channel')
+    unidirectional = LazyAttribute('unidirectional', '_parse_teach_in')
+    response_expected = LazyAttribute('response_expected', '_parse_teach_in')
     number_of_channels = 0xFF
-    rorg_of_eep = RORG.UNDEFINED
-    request_type = NOT_SPECIFIC
-    channel = None
-
-    contains_eep = True
+    rorg_of_eep = LazyAttribute('rorg_of_eep', '_parse_teach_in')
+    request_type = LazyAttribute('request_type', '_parse_teach_in')
+    channel = LazyAttribute('channel', '_parse_teach_in')
+    _lazy_attributes = RadioPacket._lazy_attributes + (
+        '_unidirectional', '_response_expected', '_rorg_of_eep', '_request_type', '_channel')
 
     @property
     def bidirectional(self):
@@ -384,19 +557,22 @@ class UTETeachInPacket(RadioPacket):
     def delete(self):
         return self.request_type == self.DELETE
 
-    def parse(self):
-        super(UTETeachInPacket, self).parse()
-        self.unidirectional = not self._bit_data[DB6.BIT_7]
-        self.response_expected = not self._bit_data[DB6.BIT_6]
-        self.request_type = enocean.utils.from_bitarray(self._bit_data[DB6.BIT_5:DB6.BIT_3])
-        self.rorg_manufacturer = enocean.utils.from_bitarray(self._bit_data[DB3.BIT_2:DB2.BIT_7] + self._bit_data[DB4.BIT_7:DB3.BIT_7])  # noqa: E501
-        self.channel = self.data[2]
-        self.rorg_type = self.data[5]
-        self.rorg_func = self.data[6]
-        self.rorg_of_eep = self.data[7]
-        if self.teach_in:
-            self.learn = True
-        return self.parsed
+    def _parse_teach_in(self):
+        values = super(UTETeachInPacket, self)._parse_teach_in()
+        # UTE teach-in telegrams always contain the EEP
+        values['contains_eep'] = True
+        bit_data = self._bit_data
+        values['unidirectional'] = not bit_data.get(DB6.BIT_7)
+        values['response_expected'] = not bit_data.get(DB6.BIT_6)
+        values['request_type'] = bit_data.get(DB6.BIT_5, 2)
+        values['rorg_manufacturer'] = (bit_data.get(DB3.BIT_2, 3) << 8) | bit_data.get(DB4.BIT_7, 8)
+        values['channel'] = self._data[2]
+        values['rorg_type'] = self._data[5]
+        values['rorg_func'] = self._data[6]
+        values['rorg_of_eep'] = self._data[7]
+        if values['request_type'] != self.DELETE:
+            values['learn'] = True
+        return values
 
     def create_response_packet(self, sender_id, response=TEACHIN_ACCEPTED):
         # Create data:
@@ -416,20 +592,18 @@ class UTETeachInPacket(RadioPacket):
 
 
 class ResponsePacket(Packet):
-    response = 0
-    response_data = []
+    __slots__ = ('response', 'response_data')
 
     def parse(self):
-        self.response = self.data[0]
-        self.response_data = self.data[1:]
+        self.response = self._data[0]
+        self.response_data = list(self._data[1:])
         return super(ResponsePacket, self).parse()
 
 
 class EventPacket(Packet):
-    event = 0
-    event_data = []
+    __slots__ = ('event', 'event_data')
 
     def parse(self):
-        self.event = self.data[0]
-        self.event_data = self.data[1:]
+        self.event = self._data[0]
+        self.event_data = list(self._data[1:])
         return super(EventPacket, self).parse()
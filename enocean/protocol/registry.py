@@ -0,0 +1,221 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+import os
+import json
+import logging
+from collections import namedtuple
+
+import enocean.utils
+from enocean.protocol.packet import Packet, RadioPacket, UTETeachInPacket
+from enocean.protocol.constants import RORG
+
+# Known device, with the profile and decoder resolved when the device is added.
+# If the profile defines commands and the device has no fixed command,
+# commands is the dispatch table (see EEP.command_table()) and the profile is resolved per packet.
+Device = namedtuple('Device', [
+    'sender', 'rorg', 'rorg_func', 'rorg_type', 'direction', 'command', 'profile', 'decoder', 'commands',
+])
+
+
+class DeviceRegistry(object):
+    '''
+    Registry of known devices, binding sender IDs to EEP profiles.
+
+    Devices are stored by sender ID as integer (RadioPacket.sender_int),
+    so finding the device of a received packet is a single dictionary lookup.
+    The profile and the decoder of the device are resolved once, when the device is added.
+
+    If path is given, the registry is persisted to it as an append-only log of JSON lines,
+    one line per added or removed device. The log is replayed when the registry is created,
+    and compacted if most of it is outdated.
+    '''
+    logger = logging.getLogger('enocean.protocol.registry')
+
+    def __init__(self, eep=None, path=None):
+        self.eep = Packet.eep if eep is None else eep
+        self.path = path
+        self._devices = {}
+        if path is not None:
+            self._load()
+
+    def _load(self):
+        ''' Replay the log in self.path '''
+        entries = 0
+        try:
+            with open(self.path, 'r') as log_file:
+                for line in log_file:
+                    entries += 1
+                    try:
+                        entry = json.loads(line)
+                        if entry['op'] == 'add':
+                            self._add(entry['sender'], entry['rorg'], entry['func'], entry['type'],
+                                      entry.get('direction'), entry.get('command'))
+                        elif entry['op'] == 'remove':
+                            self._devices.pop(entry['sender'], None)
+                    except (ValueError, KeyError, TypeError):
+                        # Partially written line, or a profile no longer in EEP
+                        self.logger.warning('Ignoring invalid registry entry: %s', line.strip())
+        except IOError:
+            # No registry yet
+            return
+        if entries > 2 * len(self._devices) + 100:
+            try:
+                self.compact()
+            except (IOError, OSError):
+                self.logger.warning('Cannot compact registry %s.', self.path)
+
+    def _append(self, entry):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'a') as log_file:
+                log_file.write(json.dumps(entry, sort_keys=True) + '\n')
+        except (IOError, OSError):
+            # Keep the registry working in memory, the change is lost on restart
+            self.logger.error('Cannot write to registry %s.', self.path)
+
+    @staticmethod
+    def _entry(device):
+        return {
+            'op': 'add',
+            'sender': device.sender,
+            'rorg': device.rorg,
+            'func': device.rorg_func,
+            'type': device.rorg_type,
+            'direction': device.direction,
+            'command': device.command,
+        }
+
+    def compact(self):
+        ''' Rewrite the log with only the current devices '''
+        if self.path is None:
+            return
+        temporary_path = '%s.%d' % (self.path, os.getpid())
+        with open(temporary_path, 'w') as log_file:
+            for device in self._devices.values():
+                log_file.write(json.dumps(self._entry(device), sort_keys=True) + '\n')
+        if os.name == 'nt' and os.path.exists(self.path):
+            os.remove(self.path)
+        os.rename(temporary_path, self.path)
+
+    @staticmethod
+    def _sender_int(sender):
+        if isinstance(sender, int):
+            return sender
+        return enocean.utils.combine_hex(sender)
+
+    def add(self, sender, rorg, rorg_func, rorg_type, direction=None, command=None):
+        '''
+        Add (or replace) device with sender ID (as integer or list of integers) and EEP.
+        returns:
+            - Device
+        '''
+        device = self._add(sender, rorg, rorg_func, rorg_type, direction, command)
+        self._append(self._entry(device))
+        return device
+
+    def _add(self, sender, rorg, rorg_func, rorg_type, direction=None, command=None):
+        profile = self.eep.find_profile(None, rorg, rorg_func, rorg_type, direction, command)
+        if profile is None:
+            raise ValueError('Profile 0x%02X-0x%02X-0x%02X not found in EEP.' % (rorg, rorg_func, rorg_type))
+        device = Device(
+            sender=self._sender_int(sender),
+            rorg=rorg,
+            rorg_func=rorg_func,
+            rorg_type=rorg_type,
+            direction=direction,
+            command=command,
+            profile=profile,
+            decoder=self.eep.decoder_for(rorg, rorg_func, rorg_type, direction, command),
+            commands=self.eep.command_table(rorg, rorg_func, rorg_type, direction) if command is None else None,
+        )
+        self._devices[device.sender] = device
+        return device
+
+    def remove(self, sender):
+        ''' Remove device, returns the removed Device (or None, if device wasn't found) '''
+        device = self._devices.pop(self._sender_int(sender), None)
+        if device is not None:
+            self._append({'op': 'remove', 'sender': device.sender})
+        return device
+
+    def learn(self, packet):
+        '''
+        Learn device from teach-in packet: 4BS teach-in with EEP, or UTE teach-in (or deletion).
+        returns:
+            - Device added, or None if the packet isn't a teach-in (or the profile isn't known)
+        '''
+        if isinstance(packet, UTETeachInPacket):
+            if packet.delete:
+                self.logger.info('Removing device %s by UTE teach-in.', packet.sender_hex)
+                self.remove(packet.sender_int)
+                return None
+            rorg = packet.rorg_of_eep
+        elif isinstance(packet, RadioPacket) and packet.rorg == RORG.BS4 and packet.learn and packet.contains_eep:
+            rorg = RORG.BS4
+        else:
+            return None
+
+        device = self.get(packet.sender_int)
+        if device is not None and (device.rorg, device.rorg_func, device.rorg_type) == \
+                (rorg, packet.rorg_func, packet.rorg_type):
+            return device
+        try:
+            device = self.add(packet.sender_int, rorg, packet.rorg_func, packet.rorg_type)
+        except ValueError:
+            self.logger.warning('Cannot learn device %s, profile 0x%02X-0x%02X-0x%02X not supported.',
+                                packet.sender_hex, rorg, packet.rorg_func, packet.rorg_type)
+            return None
+        self.logger.info('Learned device %s, profile 0x%02X-0x%02X-0x%02X.',
+                         packet.sender_hex, rorg, packet.rorg_func, packet.rorg_type)
+        return device
+
+    def get(self, sender, default=None):
+        return self._devices.get(self._sender_int(sender), default)
+
+    def __contains__(self, sender):
+        return self._sender_int(sender) in self._devices
+
+    def __len__(self):
+        return len(self._devices)
+
+    def __iter__(self):
+        return iter(self._devices.values())
+
+    def decode(self, packet, fields=None):
+        '''
+        Decode packet, if it was sent by a known device.
+        Sets the EEP of the packet and updates Packet.parsed, like Packet.parse_eep().
+        If fields (shortcuts) is given, only these fields are decoded.
+        returns:
+            - OrderedDict of the parsed values, None if the packet isn't from a known device
+              or isn't a data telegram of the device's RORG.
+        '''
+        if not isinstance(packet, RadioPacket):
+            return None
+        device = self._devices.get(packet.sender_int)
+        if device is None or device.rorg != packet.rorg:
+            return None
+        # Teach-in telegrams don't contain data of the profile
+        if packet.rorg in (RORG.BS1, RORG.BS4) and packet.learn:
+            return None
+
+        packet.rorg_func = device.rorg_func
+        packet.rorg_type = device.rorg_type
+        if device.commands is None and fields is None:
+            packet._profile = device.profile
+            if self.eep.cache is not None:
+                # Same entries as EEP.get_values(), so repeated payloads are decoded once.
+                values = self.eep.cache.decode(device.decoder, device.profile, packet._bit_data, packet._bit_status)
+            else:
+                values = device.decoder(packet._bit_data, packet._bit_status)
+        else:
+            bit_data = packet._bit_data
+            if device.commands is None:
+                packet._profile = device.profile
+            else:
+                packet._profile = self.eep.find_profile(
+                    bit_data, device.rorg, device.rorg_func, device.rorg_type, device.direction)
+            _, values = self.eep.get_values(packet._profile, bit_data, packet._bit_status, fields)
+        packet.parsed.update(values)
+        return values
@@ -0,0 +1,73 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+from enocean.protocol import crc8
+from enocean.protocol.framedecoder import HEADER_LENGTH
+from enocean.protocol.packet import Packet, RadioPacket
+
+
+def _address(address):
+    ''' Address (as integer or list of 4 integers) as bytearray '''
+    if isinstance(address, int):
+        address = [(address >> 24) & 0xFF, (address >> 16) & 0xFF, (address >> 8) & 0xFF, address & 0xFF]
+    address = bytearray(address)
+    if len(address) != 4:
+        raise ValueError('Address must contain 4 (numeric) values.')
+    return address
+
+
+class PacketTemplate(object):
+    '''
+    Template for sending the same values to many devices.
+
+    The packet is created once, like RadioPacket.create(), and the frames for each destination
+    (and sender) are produced from it by patching the addresses and recalculating the data CRC.
+    The CRC of the data preceding the sender is calculated once, as it's the same for all frames.
+    '''
+    def __init__(self, rorg, rorg_func, rorg_type, direction=None, command=None,
+                 destination=None, sender=None, learn=False, **kwargs):
+        # Packet created from the arguments, with the addresses of the template
+        self.prototype = RadioPacket.create(
+            rorg, rorg_func, rorg_type, direction, command, destination, sender, learn, **kwargs)
+        self._frame = bytearray(self.prototype.build())
+        data_length = len(self.prototype._data)
+        # Sender is followed by status, and destination by subtelegram number in optional data
+        self._sender = HEADER_LENGTH + data_length - 5
+        self._destination = HEADER_LENGTH + data_length + 1
+        self._checksum = crc8.calc(self._frame[HEADER_LENGTH:self._sender])
+
+    def _patch(self, frame, start, destination, sender):
+        ''' Patch addresses of the frame starting at start, and its data CRC '''
+        if destination is not None:
+            frame[start + self._destination:start + self._destination + 4] = _address(destination)
+        if sender is not None:
+            frame[start + self._sender:start + self._sender + 4] = _address(sender)
+        end = start + len(self._frame) - 1
+        frame[end] = crc8.calc(memoryview(frame)[start + self._sender:end], self._checksum)
+
+    def frame(self, destination=None, sender=None):
+        '''
+        Frame for destination and sender (as integer or list of 4 integers),
+        None leaves the address of the template.
+        returns:
+            - bytes, ready for sending
+        '''
+        frame = bytearray(self._frame)
+        self._patch(frame, 0, destination, sender)
+        return bytes(frame)
+
+    def frames(self, destinations, sender=None):
+        '''
+        Frames for all destinations, concatenated for writing at once.
+        returns:
+            - bytes, ready for sending
+        '''
+        destinations = list(destinations)
+        frames = self._frame * len(destinations)
+        for i, destination in enumerate(destinations):
+            self._patch(frames, i * len(self._frame), destination, sender)
+        return bytes(frames)
+
+    def packet(self, destination=None, sender=None):
+        ''' Packet for destination and sender, for sending with Communicator.send() '''
+        return Packet.parse_frame(self.frame(destination, sender))
@@ -0,0 +1,123 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+from unittest import SkipTest
+
+try:
+    import numpy as np
+except ImportError:
+    raise SkipTest('NumPy is not installed')
+
+from enocean.protocol import bulk, crc8
+from enocean.protocol.framedecoder import FrameDecoder
+from enocean.protocol.packet import RadioPacket, ResponsePacket
+from enocean.protocol.constants import PACKET
+from enocean.decorators import timing
+
+TEMPERATURE = bytearray([
+    0x55,
+    0x00, 0x0A, 0x07, 0x01,
+    0xEB,
+    0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+    0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+    0x75
+])
+
+RESPONSE = bytearray([
+    0x55,
+    0x00, 0x05, 0x00, 0x02,
+    0xCE,
+    0x00, 0xFF, 0x87, 0xCA, 0x00,
+    0xA3
+])
+
+
+def test_crc():
+    buf = np.frombuffer(bytes(TEMPERATURE + RESPONSE), dtype=np.uint8)
+    checksums = bulk.crc(buf, [1, 6, 25, 30], [4, 17, 4, 5])
+    assert checksums.tolist() == [
+        crc8.calc(TEMPERATURE[1:5]),
+        crc8.calc(TEMPERATURE[6:23]),
+        crc8.calc(RESPONSE[1:5]),
+        crc8.calc(RESPONSE[6:11]),
+    ]
+
+
+@timing(100)
+def test_frame_offsets():
+    broken_header = bytearray(TEMPERATURE)
+    broken_header[1] = 0xFF
+    broken_data = bytearray(RESPONSE)
+    broken_data[-1] = 0x00
+    data = bytes(bytearray([0x00, 0x12]) + TEMPERATURE + broken_header + RESPONSE + broken_data + TEMPERATURE[0:10])
+
+    frames = bulk.frame_offsets(data)
+    assert frames['offset'].tolist() == [2, 26 + len(broken_header), 38 + len(broken_header)]
+    assert frames['data_len'].tolist() == [10, 5, 5]
+    assert frames['opt_len'].tolist() == [7, 0, 0]
+    assert frames['packet_type'].tolist() == [PACKET.RADIO_ERP1, PACKET.RESPONSE, PACKET.RESPONSE]
+    assert frames['valid'].tolist() == [True, True, False]
+
+    # Same frames as found by FrameDecoder
+    packets = list(bulk.packets(data, frames))
+    assert [p.build() for p in packets] == [list(f) for f in FrameDecoder().feed(data)]
+    assert isinstance(packets[0], RadioPacket)
+    assert isinstance(packets[1], ResponsePacket)
+
+
+def test_empty():
+    assert len(bulk.frame_offsets(b'')) == 0
+    assert len(bulk.frame_offsets(bytearray([0x55, 0x00]))) == 0
+    assert list(bulk.packets(b'')) == []
+
+
+def test_decode_batch():
+    from enocean.protocol.eep import EEP
+    from enocean.utils import BitView
+    eep = EEP()
+    random = np.random.RandomState(0)
+    for profile_key, length in (
+        ((0xA5, 0x02, 0x05), 4),
+        ((0xA5, 0x12, 0x01), 4),
+        ((0xA5, 0x20, 0x01, 1), 4),
+        ((0xD2, 0x01, 0x01), 3),
+        ((0xF6, 0x02, 0x02), 1),
+    ):
+        payloads = random.randint(0, 256, size=(200, length)).astype(np.uint8)
+        status = random.randint(0, 256, size=200).astype(np.uint8)
+        columns = eep.decode_batch(profile_key, payloads, status)
+        decode = eep.decoder_for(*profile_key)
+        for i in range(len(payloads)):
+            try:
+                expected = decode(BitView(bytearray(payloads[i])), BitView(int(status[i]), 8))
+            except ValueError:
+                # Unknown enum value
+                continue
+            assert list(columns.keys()) == list(expected.keys())
+            for shortcut, values in expected.items():
+                assert columns[shortcut]['raw_value'][i] == values['raw_value']
+                assert columns[shortcut]['value'][i] == values['value']
+
+
+def test_decode_batch_temperature():
+    from enocean.protocol.eep import EEP
+    columns = EEP().decode_batch((0xA5, 0x02, 0x05), [b'\x00\x00\x55\x08', b'\x00\x00\xFF\x08', b'\x00\x00\x00\x08'])
+    assert list(columns.keys()) == ['TMP']
+    assert columns['TMP']['raw_value'].tolist() == [0x55, 0xFF, 0x00]
+    assert np.allclose(columns['TMP']['value'], [26.666666, 0, 40])
+
+
+def test_decode_batch_fields():
+    from enocean.protocol.eep import EEP
+    payloads = [b'\x00\x12\x34\x08', b'\x00\x00\xFF\x08']
+    columns = EEP().decode_batch((0xA5, 0x12, 0x01), payloads, fields=('MR', ))
+    assert list(columns.keys()) == ['MR']
+    assert columns['MR']['raw_value'].tolist() == [0x1234, 0xFF]
+    assert list(EEP().decode_batch((0xA5, 0x12, 0x01), payloads, fields='DT').keys()) == ['DT']
+
+
+@timing(10)
+def test_decode_batch_speed():
+    from enocean.protocol.eep import EEP
+    payloads = np.random.RandomState(0).randint(0, 256, size=(100000, 4)).astype(np.uint8)
+    columns = EEP().decode_batch((0xA5, 0x12, 0x01), payloads)
+    assert len(columns['MR']['value']) == 100000
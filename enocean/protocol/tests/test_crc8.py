@@ -0,0 +1,100 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+import random
+
+from enocean.protocol import crc8
+from enocean.decorators import timing
+
+FRAME_4BS = bytearray([
+    0x55,
+    0x00, 0x0A, 0x07, 0x01,
+    0xEB,
+    0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+    0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+    0x75
+])
+
+# VLD telegram with the maximum payload of 14 bytes: RORG, payload, sender and status,
+# followed by the optional data. The longest data CRC of radio telegrams.
+_RAND = random.Random(0)
+DATA_VLD = bytearray(
+    [0xD2] + [_RAND.randrange(256) for _ in range(14)] + [0x01, 0x94, 0xE3, 0xB9, 0x00] +
+    [0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00])
+
+FRAME_VLD = bytearray([0x55, 0x00, 0x14, 0x07, 0x01])
+FRAME_VLD += bytearray([crc8.calc(FRAME_VLD[1:5])]) + DATA_VLD + bytearray([crc8.calc(DATA_VLD)])
+
+
+def reference_calc(msg):
+    ''' Bytewise CRC8 calculation, as originally implemented '''
+    checksum = 0
+    for byte in msg:
+        checksum = crc8.CRC_TABLE[checksum & 0xFF ^ byte & 0xFF]
+    return checksum
+
+
+def test_calc():
+    rand = random.Random(1)
+    for length in list(range(0, 20)) + [127, 128, 255, 256, 1024]:
+        data = bytearray(rand.randrange(256) for _ in range(length))
+        expected = reference_calc(data)
+        assert crc8.calc(data) == expected
+        assert crc8.calc(bytes(data)) == expected
+        assert crc8.calc(list(data)) == expected
+        assert crc8.calc(memoryview(data)) == expected
+        # Unaligned slices of memoryview
+        assert crc8.calc(memoryview(b'\x00' + data)[1:]) == expected
+
+
+def test_validate_frame():
+    assert crc8.validate_frame(FRAME_4BS)
+    assert crc8.validate_frame(bytes(FRAME_4BS))
+    assert crc8.validate_frame(list(FRAME_4BS))
+    assert crc8.validate_frame(memoryview(FRAME_4BS))
+    assert crc8.validate_frame(FRAME_VLD)
+    # Incomplete or too long frame
+    assert not crc8.validate_frame(FRAME_4BS[:-1])
+    assert not crc8.validate_frame(FRAME_4BS + bytearray([0x00]))
+    assert not crc8.validate_frame(FRAME_4BS[:5])
+
+    broken = bytearray(FRAME_4BS)
+    broken[5] = 0x00
+    assert not crc8.validate_frame(broken)
+    broken = bytearray(FRAME_4BS)
+    broken[10] = 0x00
+    assert not crc8.validate_frame(broken)
+
+
+# Benchmarks, compare with the reference implementation by running with WITH_TIMINGS=1
+@timing(rounds=10000)
+def test_benchmark_4bs_reference():
+    view = memoryview(FRAME_4BS)
+    assert reference_calc(view[1:5]) == view[5]
+    assert reference_calc(view[6:-1]) == view[-1]
+
+
+@timing(rounds=10000)
+def test_benchmark_4bs():
+    view = memoryview(FRAME_4BS)
+    assert crc8.calc(view[1:5]) == view[5]
+    assert crc8.calc(view[6:-1]) == view[-1]
+
+
+@timing(rounds=10000)
+def test_benchmark_4bs_validate_frame():
+    assert crc8.validate_frame(FRAME_4BS)
+
+
+@timing(rounds=10000)
+def test_benchmark_vld_reference():
+    reference_calc(DATA_VLD)
+
+
+@timing(rounds=10000)
+def test_benchmark_vld():
+    crc8.calc(DATA_VLD)
+
+
+@timing(rounds=10000)
+def test_benchmark_vld_validate_frame():
+    assert crc8.validate_frame(FRAME_VLD)
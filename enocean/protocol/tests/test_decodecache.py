@@ -0,0 +1,81 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+from enocean.protocol.eep import EEP
+from enocean.protocol.decodecache import DecodeCache
+from enocean.utils import BitView
+from enocean.decorators import timing
+
+EEP_WITH_CACHE = EEP(cache=DecodeCache(size=2))
+TEMPERATURE = EEP_WITH_CACHE.find_profile(None, 0xA5, 0x02, 0x05)
+STATUS = BitView(0, 8)
+
+
+def temperature(raw_value):
+    ''' Data of A5-02-05 telegram with raw temperature value '''
+    return BitView([0x00, 0x00, raw_value, 0x08])
+
+
+def test_decode_cache():
+    eep = EEP(cache=DecodeCache(size=2))
+    profile = eep.find_profile(None, 0xA5, 0x02, 0x05)
+    _, first = eep.get_values(profile, temperature(0x55), STATUS)
+    _, second = eep.get_values(profile, temperature(0x55), STATUS)
+    # Values of identical payloads are shared
+    assert first is second
+    assert second['TMP']['raw_value'] == 0x55
+    assert (eep.cache.hits, eep.cache.misses, eep.cache.evictions) == (1, 1, 0)
+    # ... and same as without the cache
+    assert first == EEP().get_values(profile, temperature(0x55), STATUS)[1]
+
+    # Shared values can't be modified
+    for modify in (lambda: first.update({'TMP': None}), lambda: first['TMP'].update({'value': 0})):
+        try:
+            modify()
+            assert False
+        except (TypeError, AttributeError):
+            pass
+
+    # Different status is a different payload
+    eep.get_values(profile, temperature(0x55), BitView(0x30, 8))
+    assert eep.cache.misses == 2
+    eep.get_values(profile, temperature(0x55), STATUS)
+    eep.get_values(profile, temperature(0x56), STATUS)
+    # Status 0x30 was least recently used
+    assert eep.cache.evictions == 1
+    assert len(eep.cache) == 2
+    eep.get_values(profile, temperature(0x55), STATUS)
+    assert (eep.cache.hits, eep.cache.misses) == (3, 3)
+
+    eep.cache.clear()
+    assert len(eep.cache) == 0
+
+    # Errors aren't cached
+    try:
+        eep.get_values(profile, BitView(0, 8), STATUS)
+        assert False
+    except IndexError:
+        pass
+    assert len(eep.cache) == 0
+
+
+def test_fifo():
+    cache = DecodeCache(size=2, policy='fifo')
+    eep = EEP(cache=cache)
+    profile = eep.find_profile(None, 0xA5, 0x02, 0x05)
+    for raw_value in (0x55, 0x56, 0x55, 0x57, 0x55):
+        eep.get_values(profile, temperature(raw_value), STATUS)
+    # 0x55 is evicted as the oldest payload, although it was used most recently
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 4, 2)
+
+    for size, policy in ((0, 'lru'), (10, 'random')):
+        try:
+            DecodeCache(size, policy)
+            assert False
+        except ValueError:
+            pass
+
+
+@timing(10000)
+def test_cached_values():
+    EEP_WITH_CACHE.get_values(TEMPERATURE, temperature(0x55), STATUS)
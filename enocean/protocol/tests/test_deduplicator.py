@@ -0,0 +1,85 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+from enocean.protocol.packet import Packet, RadioPacket
+from enocean.protocol.deduplicator import Deduplicator
+from enocean.protocol.constants import PACKET
+from enocean.decorators import timing
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def temperature(raw_value=0x55, repeater_count=0, dBm=-45, sender=[0x01, 0x81, 0xB7, 0x44]):
+    ''' A5-02-05 telegram, received with repeater count and dBm '''
+    return RadioPacket(
+        PACKET.RADIO_ERP1,
+        data=[0xA5, 0x00, 0x00, raw_value, 0x08] + sender + [repeater_count],
+        optional=[0x01, 0xFF, 0xFF, 0xFF, 0xFF, -dBm, 0x00])
+
+
+def test_duplicates():
+    clock = Clock()
+    deduplicator = Deduplicator(window=0.5, clock=clock)
+    original = temperature()
+    assert not deduplicator.is_duplicate(original)
+    # Repeated telegram, with a weaker signal
+    clock.now += 0.1
+    assert deduplicator.is_duplicate(temperature(repeater_count=1, dBm=-80))
+    assert deduplicator.strongest(original) is original
+    # Stronger signal is remembered, without modifying the dispatched original
+    stronger = temperature(repeater_count=1, dBm=-40)
+    assert deduplicator.is_duplicate(stronger)
+    assert deduplicator.strongest(original) is stronger
+    assert deduplicator.strongest(temperature(repeater_count=2, dBm=-90)) is stronger
+    assert (original.dBm, original.repeater_count, original.status) == (-45, 0, 0)
+    assert original.optional[5] == 45
+    assert deduplicator.duplicates == 2
+
+    # Different data, sender or destination aren't duplicates
+    assert not deduplicator.is_duplicate(temperature(0x56))
+    assert not deduplicator.is_duplicate(temperature(sender=[0x01, 0x81, 0xB7, 0x45]))
+    addressed = temperature()
+    addressed.optional[1:5] = [0x01, 0x02, 0x03, 0x04]
+    assert not deduplicator.is_duplicate(addressed)
+    # Only radio packets are deduplicated
+    response = Packet(PACKET.RESPONSE, [0x00])
+    assert not deduplicator.is_duplicate(response)
+    assert not deduplicator.is_duplicate(response)
+    assert deduplicator.strongest(response) is response
+    assert len(deduplicator) == 4
+
+
+def test_expiry():
+    clock = Clock()
+    deduplicator = Deduplicator(window=0.5, buckets=5, clock=clock)
+    deduplicator.is_duplicate(temperature())
+    clock.now += 0.25
+    deduplicator.is_duplicate(temperature(0x56))
+    clock.now += 0.3
+    # First telegram has expired, the second one is still within the window
+    assert not deduplicator.is_duplicate(temperature())
+    assert deduplicator.is_duplicate(temperature(0x56))
+    assert len(deduplicator) == 2
+    # Expired packets are forgotten
+    unseen = temperature(0x57)
+    assert deduplicator.strongest(unseen) is unseen
+
+    # Whole window passed at once
+    clock.now += 10
+    assert not deduplicator.is_duplicate(temperature(0x56))
+    assert len(deduplicator) == 1
+
+
+DEDUPLICATOR = Deduplicator()
+PACKET_TO_CHECK = temperature()
+
+
+@timing(10000)
+def test_duplicate_speed():
+    DEDUPLICATOR.is_duplicate(PACKET_TO_CHECK)
@@ -0,0 +1,85 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+from enocean.protocol.packet import RadioPacket
+from enocean.protocol.delta import DeltaDecoder
+from enocean.protocol.registry import DeviceRegistry
+from enocean.protocol.constants import PACKET
+from enocean.decorators import timing
+
+SENDER = [0x01, 0x81, 0xB7, 0x44]
+
+
+def temperature(raw_value, sender=SENDER):
+    ''' A5-02-05 telegram with raw temperature value '''
+    return RadioPacket(PACKET.RADIO_ERP1, data=[0xA5, 0x00, 0x00, raw_value, 0x08] + sender + [0x00], optional=[])
+
+
+def test_delta():
+    decoder = DeltaDecoder()
+    changes = decoder.decode(temperature(0x55), 0x02, 0x05)
+    assert list(changes.keys()) == ['TMP']
+    assert changes['TMP']['raw_value'] == 0x55
+
+    # Identical telegrams aren't decoded
+    packet = temperature(0x55)
+    assert decoder.decode(packet, 0x02, 0x05) == {}
+    assert 'TMP' not in packet.parsed
+    assert decoder.identical == 1
+
+    changes = decoder.decode(temperature(0x56), 0x02, 0x05)
+    assert changes['TMP']['raw_value'] == 0x56
+
+    # Senders are tracked separately
+    changes = decoder.decode(temperature(0x56, sender=[0x01, 0x02, 0x03, 0x04]), 0x02, 0x05)
+    assert changes['TMP']['raw_value'] == 0x56
+
+    decoder.forget(0x0181B744)
+    assert decoder.decode(temperature(0x56), 0x02, 0x05)['TMP']['raw_value'] == 0x56
+
+
+def test_deadband():
+    # A5-02-05: 255 steps for 40 degrees, ~0.157 degrees per step
+    decoder = DeltaDecoder(deadbands={'TMP': 0.5})
+    assert decoder.decode(temperature(100), 0x02, 0x05)['TMP']['raw_value'] == 100
+    assert decoder.decode(temperature(101), 0x02, 0x05) == {}
+    assert decoder.decode(temperature(102), 0x02, 0x05) == {}
+    assert decoder.decode(temperature(103), 0x02, 0x05) == {}
+    assert decoder.unchanged == 3
+    # Compared to the last emitted value, so slow drift is emitted eventually
+    assert decoder.decode(temperature(104), 0x02, 0x05)['TMP']['raw_value'] == 104
+    assert decoder.decode(temperature(102), 0x02, 0x05) == {}
+
+
+@timing(1000)
+def test_identical_speed():
+    decoder = DeltaDecoder()
+    packet = temperature(0x55)
+    decoder.decode(packet, 0x02, 0x05)
+    for i in range(10):
+        assert decoder.decode(packet, 0x02, 0x05) == {}
+
+
+def test_failing_payload():
+    # A5-11-02 with an unknown enum value
+    decoder = DeltaDecoder()
+    for i in range(2):
+        packet = RadioPacket(PACKET.RADIO_ERP1, data=[0xA5, 0x00, 0x00, 0x00, 0x08] + SENDER + [0x00], optional=[])
+        try:
+            decoder.decode(packet, 0x11, 0x02)
+            assert False
+        except ValueError:
+            pass
+    assert decoder.identical == 0
+
+
+def test_registry_values():
+    registry = DeviceRegistry()
+    registry.add(SENDER, 0xA5, 0x02, 0x05)
+    decoder = DeltaDecoder()
+    packet = temperature(0x55)
+    registry.decode(packet)
+    # Values parsed by the registry are used as they are
+    packet.parsed['TMP'] = dict(packet.parsed['TMP'], raw_value=-1)
+    assert decoder.decode(packet)['TMP']['raw_value'] == -1
+    assert decoder.decode(temperature(0x56), 0x02, 0x05)['TMP']['raw_value'] == 0x56
@@ -1,9 +1,19 @@
 # -*- encoding: utf-8 -*-
 from __future__ import print_function, unicode_literals, division, absolute_import
-
-from enocean.protocol.packet import Packet
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+
+import enocean
+import enocean.protocol.eep
+from enocean.protocol.packet import Packet, RadioPacket
 from enocean.protocol.eep import EEP
-from enocean.protocol.constants import RORG
+from enocean.protocol.constants import RORG, PACKET
+from enocean.utils import BitView
 from enocean.decorators import timing
 
 
@@ -266,3 +276,300 @@ def test_fails():
     ]))
     assert eep.find_profile(packet._bit_data, 0xD2, 0x01, 0x01) is not None
     assert eep.find_profile(packet._bit_data, 0xD2, 0x01, 0x01, command=-1) is None
+
+
+def test_compiled_profile():
+    eep = EEP()
+    profile = eep.find_profile([], 0xA5, 0x02, 0x05)
+    # Profiles are compiled once
+    assert eep.find_profile([], 0xA5, 0x02, 0x05) is profile
+    assert [field.shortcut for field in profile.fields] == ['TMP']
+    field = profile.shortcuts['TMP']
+    assert field.kind == 'value'
+    assert field.offset == 16
+    assert field.size == 8
+    assert field.unit == '°C'
+    assert field.slope * (255 - field.range_min) + field.scale_min == 0
+
+    profile = eep.find_profile([], 0xD5, 0x00, 0x01)
+    assert profile.shortcuts['CO'].kind == 'enum'
+    assert profile.shortcuts['CO'].items == {0: 'open', 1: 'closed'}
+    assert eep.find_profile([], 0xD2, 0x01, 0x01, command=1).command == '1'
+
+
+@timing(1000)
+def test_decoder_for():
+    status, buf, p = Packet.parse_msg(bytearray([
+        0x55,
+        0x00, 0x09, 0x07, 0x01,
+        0x56,
+        0xD2, 0x04, 0x00, 0x64, 0x01, 0x94, 0xE3, 0xB9, 0x00,
+        0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00,
+        0xE4
+    ]))
+    eep = EEP()
+    decode = eep.decoder_for(0xD2, 0x01, 0x01)
+    assert eep.decoder_for(0xD2, 0x01, 0x01) is decode
+    values = decode(p._bit_data, p._bit_status)
+    assert list(values.keys()) == ['PF', 'PFD', 'CMD', 'OC', 'EL', 'IO', 'LC', 'OV']
+    assert values['OV'] == {
+        'description': 'Output value',
+        'unit': '',
+        'value': 'Output value 100% or ON',
+        'raw_value': 100,
+    }
+
+    # Same values as decoded by the generic implementation, from lists of booleans
+    profile = eep.find_profile(None, 0xD2, 0x01, 0x01)
+    assert eep.get_values(profile, list(p._bit_data), list(p._bit_status))[1] == values
+
+    assert eep.decoder_for(0xD2, 0x01, 0xFF) is None
+
+
+@contextmanager
+def cache_paths(writable=True):
+    ''' Point the profile caches to a temporary directory, the one next to EEP.xml unwritable, if not writable '''
+    original_paths = enocean.protocol.eep.CACHE_PATH, enocean.protocol.eep.USER_CACHE_PATH
+    directory = tempfile.mkdtemp()
+    package_directory = os.path.join(directory, 'package')
+    if writable:
+        os.mkdir(package_directory)
+    else:
+        # A file in place of the directory can't be written, even by root
+        open(package_directory, 'wb').close()
+    enocean.protocol.eep.CACHE_PATH = os.path.join(package_directory, 'EEP.pickle')
+    enocean.protocol.eep.USER_CACHE_PATH = os.path.join(directory, 'user', 'enocean', 'EEP.pickle')
+    try:
+        yield
+    finally:
+        enocean.protocol.eep.CACHE_PATH, enocean.protocol.eep.USER_CACHE_PATH = original_paths
+        shutil.rmtree(directory)
+
+
+@timing(100)
+def test_cached_profiles():
+    ''' Compiled profiles are loaded from cache, without parsing the XML '''
+    with cache_paths():
+        eep = EEP()
+        assert eep.find_profile(None, 0xA5, 0x02, 0x05) is not None
+        assert eep._soup is not None
+
+        cached = EEP()
+        assert cached.init_ok
+        assert cached.find_profile(None, 0xA5, 0x02, 0x05) is not None
+        # BeautifulSoup isn't needed
+        assert cached._soup is None
+
+
+def test_profile_cache_invalidation():
+    with cache_paths():
+        # Missing cache is created
+        eep = EEP()
+        assert eep.preload()
+        assert eep._soup is not None
+        assert os.path.exists(enocean.protocol.eep.CACHE_PATH)
+
+        cached = EEP()
+        assert cached.preload()
+        assert cached._soup is None
+        assert cached.telegrams == eep.telegrams
+
+        # Broken cache is replaced
+        with open(enocean.protocol.eep.CACHE_PATH, 'wb') as cache_file:
+            cache_file.write(b'broken')
+        eep = EEP()
+        assert eep.preload()
+        assert eep._soup is not None
+        cached = EEP()
+        assert cached.preload()
+        assert cached._soup is None
+
+
+def test_unwritable_profile_cache():
+    with cache_paths(writable=False):
+        # Profiles are cached in the user's cache directory instead
+        eep = EEP()
+        assert eep.preload()
+        assert eep._soup is not None
+        assert not os.path.exists(enocean.protocol.eep.CACHE_PATH)
+        assert os.path.exists(enocean.protocol.eep.USER_CACHE_PATH)
+
+        cached = EEP()
+        assert cached.preload()
+        assert cached._soup is None
+        assert cached.telegrams == eep.telegrams
+
+        # Profiles are still loaded, if no cache can be written
+        enocean.protocol.eep.USER_CACHE_PATH = os.path.join(enocean.protocol.eep.CACHE_PATH, 'EEP.pickle')
+        eep = EEP()
+        assert eep.preload()
+        assert eep._soup is not None
+        assert eep.find_profile(None, 0xA5, 0x02, 0x05) is not None
+
+
+def test_lazy_loading():
+    # Make sure the cache exists
+    EEP().preload()
+    eep = EEP()
+    # Nothing is loaded, until profiles are needed
+    assert eep._sections is None
+    assert eep.find_profile(None, 0xA5, 0x02, 0x05) is not None
+    # Only the requested RORG is unpickled
+    assert list(eep._telegrams.keys()) == [0xA5]
+
+    eep.preload([0xF6])
+    assert sorted(eep._telegrams.keys()) == [0xA5, 0xF6]
+    assert eep.preload()
+    assert sorted(eep._telegrams.keys()) == [0xA5, 0xD2, 0xD5, 0xF6]
+
+
+def test_import_time():
+    ''' Importing enocean.protocol.packet should not load EEP.xml (or import BeautifulSoup) '''
+    environment = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(enocean.__file__))))
+    output = subprocess.check_output([sys.executable, '-c', (
+        'import sys, time\n'
+        'start = time.time()\n'
+        'import enocean.protocol.packet\n'
+        'duration = (time.time() - start) * 1e3\n'
+        'print("%f %s %s" % (duration, "bs4" in sys.modules, enocean.protocol.packet.Packet.eep._sections is None))\n'
+    )], env=environment)
+    duration, bs4_imported, not_loaded = output.decode('ascii').split()
+    print('Importing enocean.protocol.packet took %s ms.' % duration)
+    assert bs4_imported == 'False'
+    assert not_loaded == 'True'
+
+
+@timing(1000)
+def test_enum_lookup():
+    eep = EEP()
+    profile = eep.find_profile(None, 0xF6, 0x05, 0x01)
+    field = profile.shortcuts['WAS']
+    assert eep._get_label(field, 0x11) == 'Water detected'
+    assert eep._get_label(field, 0x00) == 'not specified'
+    assert eep._get_label(field, 0x10) == 'not specified'
+    assert eep._get_label(field, 0x12) == 'not specified'
+    assert eep._get_label(field, 0xFF) == 'not specified'
+    assert eep._get_label(field, 0x100) is None
+    assert field.values['Water detected'] == 0x11
+
+    # Range items with the value in the description
+    field = eep.find_profile(None, 0xD2, 0x01, 0x01).shortcuts['OV']
+    assert eep._get_label(field, 0) == 'Output value 0% or OFF'
+    assert eep._get_label(field, 55) == 'Output value 55% or ON'
+    assert eep._get_label(field, 101) == 'Not used'
+    assert eep._get_label(field, 128) is None
+
+
+def test_interval_table():
+    from enocean.protocol.eep import _interval_table
+    # Overlapping ranges are left to the range listed first
+    assert _interval_table([(0, 9, 'a'), (5, 20, 'b {value}'), (12, 14, '{value:02d}')]) == (
+        (0, 9, 'a', ('a',)),
+        (10, 20, 'b {value}', ('b ', '')),
+    )
+
+
+@timing(1000)
+def test_record():
+    status, buf, p = Packet.parse_msg(bytearray([
+        0x55,
+        0x00, 0x09, 0x07, 0x01,
+        0x56,
+        0xD2, 0x04, 0x00, 0x64, 0x01, 0x94, 0xE3, 0xB9, 0x00,
+        0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00,
+        0xE4
+    ]))
+    record = p.parse_record(0x01, 0x01)
+    assert p.parsed == {}
+    assert record.OV == 'Output value 100% or ON'
+    assert record.OV_raw == 100
+    assert record.value('OV') == 'Output value 100% or ON'
+    assert record.raw_value('OV') == 100
+    assert record.shortcuts == ('PF', 'PFD', 'CMD', 'OC', 'EL', 'IO', 'LC', 'OV')
+    assert record.descriptions['OV'] == 'Output value'
+    assert record.as_dict() == p.eep.get_values(p._profile, p._bit_data, p._bit_status)[1]
+    # Records of the same profile share the class
+    assert type(p.parse_record(0x01, 0x01)) is type(record)
+    assert type(record) is p.eep.record_class(p._profile)
+
+    # Shortcuts, which aren't valid identifiers
+    record = EEP().decoder_for(0xA5, 0x13, 0x01, command=1, record=True)(BitView(0x00000004, 32), BitView(0, 8))
+    assert record.D_N == record.value('D/N') == 'night'
+
+
+def test_record_memory():
+    eep = EEP()
+    profile = eep.find_profile(None, 0xA5, 0x04, 0x01)
+    data = BitView(0x0080FF08, 32)
+    status = BitView(0, 8)
+    count = 1000
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        values = [eep.get_values(profile, data, status)[1] for i in range(count)]
+        dictionaries = (tracemalloc.get_traced_memory()[0] - start) / count
+        del values
+        start = tracemalloc.get_traced_memory()[0]
+        records = [eep.get_record(profile, data, status) for i in range(count)]
+        per_record = (tracemalloc.get_traced_memory()[0] - start) / count
+        del records
+    finally:
+        tracemalloc.stop()
+    print('Decoded values use %d bytes as dictionaries, %d bytes as records.' % (dictionaries, per_record))
+    assert per_record * 4 < dictionaries
+
+
+@timing(1000)
+def test_command_dispatch():
+    # D2-01-01 telegrams, "Actuator Set Output" (command 1) and "Actuator Status Response" (command 4)
+    optional = [0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00]
+    set_output = RadioPacket(
+        PACKET.RADIO_ERP1, data=[0xD2, 0x01, 0x1E, 0x64, 0x01, 0x94, 0xE3, 0xB9, 0x00], optional=optional)
+    status_response = RadioPacket(
+        PACKET.RADIO_ERP1, data=[0xD2, 0x04, 0x00, 0x64, 0x01, 0x94, 0xE3, 0xB9, 0x00], optional=optional)
+    assert set_output.parse_eep(0x01, 0x01) == ['CMD', 'DV', 'IO', 'OV']
+    assert set_output._profile.command == '1'
+    assert set_output.parsed['DV']['raw_value'] == 0
+    assert status_response.parse_eep(0x01, 0x01) == ['PF', 'PFD', 'CMD', 'OC', 'EL', 'IO', 'LC', 'OV']
+    assert status_response._profile.command == '4'
+
+    eep = EEP()
+    field, table = eep.command_table(0xD2, 0x01, 0x01)
+    assert (field.offset, field.size) == (4, 4)
+    assert sorted(table.keys()) == [1, 4]
+    assert eep.command_table(0xA5, 0x02, 0x05) is None
+    # Given command takes precedence over the command in data
+    assert eep.find_profile(BitView(0x041E64, 24), 0xD2, 0x01, 0x01, command=1).command == '1'
+    # Unknown commands fall back to the first data description
+    assert eep.find_profile(BitView(0x0F1E64, 24), 0xD2, 0x01, 0x01).command == '4'
+    # Command in the last nibble of DB0
+    assert eep.find_profile(BitView(0x00000025, 32), 0xA5, 0x13, 0x01).command == '2'
+
+
+@timing(1000)
+def test_projection():
+    # A5-12-01 meter reading
+    packet = RadioPacket(
+        PACKET.RADIO_ERP1, data=[0xA5, 0x00, 0x12, 0x34, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00], optional=[])
+    assert packet.parse_eep(0x12, 0x01, fields=('MR', )) == ['MR']
+    assert list(packet.parsed.keys()) == ['MR']
+    assert packet.parsed['MR']['raw_value'] == 0x1234
+
+    eep = EEP()
+    profile = eep.find_profile(None, 0xA5, 0x12, 0x01)
+    data = BitView(0x00123408, 32)
+    status = BitView(0, 8)
+    _, all_values = eep.get_values(profile, data, status)
+    _, values = eep.get_values(profile, data, status, fields=('DT', 'MR'))
+    # In the order of the profile
+    assert list(values.keys()) == ['MR', 'DT']
+    assert values['DT'] == all_values['DT']
+    assert eep.get_values(profile, data, status, fields='TI')[1]['TI'] == all_values['TI']
+    # Same on the generic path
+    assert eep.get_values(profile, list(data), list(status), fields=('DT', 'MR'))[1] == values
+    # Decoders are generated once per subset of fields
+    assert eep._decoder(profile, fields=('MR', )) is eep._decoder(profile, fields=('MR', ))
+    assert list(eep.decoder_for(0xA5, 0x12, 0x01, fields=['TI'])(data, status).keys()) == ['TI']
+    # Unknown shortcuts are ignored
+    assert eep.get_values(profile, data, status, fields=('XX', ))[1] == {}
@@ -0,0 +1,104 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+from enocean.protocol.framedecoder import FrameDecoder
+from enocean.protocol.packet import Packet, RadioPacket, ResponsePacket
+from enocean.decorators import timing
+
+TEMPERATURE = bytearray([
+    0x55,
+    0x00, 0x0A, 0x07, 0x01,
+    0xEB,
+    0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+    0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+    0x75
+])
+
+RESPONSE = bytearray([
+    0x55,
+    0x00, 0x05, 0x00, 0x02,
+    0xCE,
+    0x00, 0xFF, 0x87, 0xCA, 0x00,
+    0xA3
+])
+
+
+@timing(1000)
+def test_multiple_frames():
+    decoder = FrameDecoder()
+    frames = decoder.feed(TEMPERATURE + RESPONSE + TEMPERATURE)
+    assert len(frames) == 3
+    assert bytes(frames[0]) == bytes(TEMPERATURE)
+    assert bytes(frames[1]) == bytes(RESPONSE)
+    assert bytes(frames[2]) == bytes(TEMPERATURE)
+    assert len(decoder.buffer) == 0
+
+    assert isinstance(Packet.parse_frame(frames[0]), RadioPacket)
+    assert isinstance(Packet.parse_frame(frames[1]), ResponsePacket)
+
+
+def test_partial_frames():
+    decoder = FrameDecoder()
+    data = TEMPERATURE + RESPONSE
+    assert decoder.feed(data[0:3]) == []
+    assert decoder.feed(data[3:20]) == []
+    frames = decoder.feed(data[20:30])
+    assert len(frames) == 1
+    assert bytes(frames[0]) == bytes(TEMPERATURE)
+    assert decoder.buffer == data[24:30]
+
+    frames = decoder.feed(data[30:])
+    assert len(frames) == 1
+    assert bytes(frames[0]) == bytes(RESPONSE)
+    assert len(decoder.buffer) == 0
+
+
+def test_frames_are_retained():
+    ''' Frames returned by feed() must stay valid, while more data is fed to the decoder '''
+    decoder = FrameDecoder()
+    frames = decoder.feed(TEMPERATURE + RESPONSE[0:4])
+    decoder.feed(RESPONSE[4:])
+    decoder.feed(TEMPERATURE)
+    assert bytes(frames[0]) == bytes(TEMPERATURE)
+
+
+def test_garbage_and_crc_errors():
+    decoder = FrameDecoder()
+    broken = bytearray(TEMPERATURE)
+    broken[-1] = 0x00
+    assert decoder.feed(bytearray([0x00, 0xFF, 0x12])) == []
+    assert len(decoder.buffer) == 0
+
+    frames = decoder.feed(bytearray([0x01, 0x02]) + broken + RESPONSE)
+    assert len(frames) == 1
+    assert bytes(frames[0]) == bytes(RESPONSE)
+    assert decoder.crc_errors == 1
+
+
+def test_resynchronization():
+    ''' A corrupted header must not swallow the frames following it '''
+    decoder = FrameDecoder()
+    # Corrupt the data length of the first frame, claiming a ~64 KB frame
+    broken = bytearray(TEMPERATURE)
+    broken[1] = 0xFF
+    frames = decoder.feed(broken + RESPONSE + TEMPERATURE)
+    assert len(frames) == 2
+    assert bytes(frames[0]) == bytes(RESPONSE)
+    assert bytes(frames[1]) == bytes(TEMPERATURE)
+    assert len(decoder.buffer) == 0
+    # The false sync byte (0x55) within the data of the broken frame is also rejected
+    assert decoder.crc_errors == 2
+    assert decoder.skipped == len(broken)
+
+
+def test_false_sync_byte():
+    ''' Header CRC is checked as soon as the header is received '''
+    decoder = FrameDecoder()
+    assert decoder.feed(bytearray([0x55, 0x00, 0x55, 0x00, 0x01, 0x02, 0x55])) == []
+    # The second sync byte can't be checked yet, as the header is incomplete
+    assert decoder.buffer == bytearray([0x55, 0x00, 0x01, 0x02, 0x55])
+    assert decoder.skipped == 2
+    frames = decoder.feed(RESPONSE[1:])
+    assert len(frames) == 1
+    assert bytes(frames[0]) == bytes(RESPONSE)
+    assert decoder.skipped == 6
@@ -1,7 +1,11 @@
 # -*- encoding: utf-8 -*-
 from __future__ import print_function, unicode_literals, division, absolute_import
+import os
+import copy
+import pickle
+import tracemalloc
 
-from enocean.protocol.packet import Packet, EventPacket
+from enocean.protocol.packet import Packet, EventPacket, LazyAttribute
 from enocean.protocol.constants import PACKET, PARSE_RESULT, EVENT_CODE
 from enocean.decorators import timing
 
@@ -204,3 +208,112 @@ def test_event_packet():
     assert packet.event == EVENT_CODE.SA_RECLAIM_NOT_SUCCESFUL
     assert packet.event_data == []
     assert packet.optional == []
+
+
+def test_packet_header_crc_resync():
+    ''' On header CRC error, parsing continues after the sync byte instead of skipping the message length '''
+    data = bytearray([
+        0x55,
+        0xFF, 0x05, 0x00, 0x02,
+        0xCE,
+        0x55,
+        0x00, 0x05, 0x00, 0x02,
+        0xCE,
+        0x00, 0xFF, 0x80, 0x00, 0x00,
+        0xDA
+    ])
+    status, remainder, packet = Packet.parse_msg(data)
+    assert status == PARSE_RESULT.CRC_MISMATCH
+    assert packet is None
+    assert remainder == list(data[1:])
+
+    status, remainder, packet = Packet.parse_msg(remainder)
+    assert status == PARSE_RESULT.OK
+    assert packet.packet_type == PACKET.RESPONSE
+    assert remainder == []
+
+
+def test_lazy_attributes():
+    data = bytearray([
+        0x55,
+        0x00, 0x0A, 0x07, 0x01,
+        0xEB,
+        0xA5, 0x08, 0x28, 0x46, 0x80, 0x01, 0x8A, 0x7B, 0x30, 0x00,
+        0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x49, 0x00,
+        0x26
+    ])
+    _, _, packet = Packet.parse_msg(data)
+    assert isinstance(type(packet).sender, LazyAttribute)
+    assert packet.sender == [0x01, 0x8A, 0x7B, 0x30]
+    assert packet.destination == [0xFF, 0xFF, 0xFF, 0xFF]
+    assert packet.dBm == -0x49
+    assert packet.learn is True
+    assert packet.contains_eep is True
+    assert packet.rorg_func == 0x02
+    assert packet.rorg_type == 0x05
+    assert packet.rorg_manufacturer == 0x46
+
+    # Values set before first access are retained
+    _, _, packet = Packet.parse_msg(data)
+    packet.rorg_func = 0x10
+    assert packet.learn is True
+    assert packet.rorg_func == 0x10
+    assert packet.rorg_type == 0x05
+
+    # Values are reset, if the packet is parsed again
+    packet.parse()
+    assert packet.rorg_func == 0x02
+
+
+def test_packet_memory():
+    ''' Memory used by received packets, kept in memory '''
+    frame = bytes(bytearray([
+        0x55,
+        0x00, 0x0A, 0x07, 0x01,
+        0xEB,
+        0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+        0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+        0x75
+    ]))
+    count = 1000
+    # Parse once, to make sure EEP and such are loaded
+    Packet.parse_frame(frame)
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        packets = [Packet.parse_frame(frame) for i in range(count)]
+        per_packet = (tracemalloc.get_traced_memory()[0] - start) / count
+        for packet in packets:
+            assert packet.sender_int == 0x0181B744
+        per_packet_accessed = (tracemalloc.get_traced_memory()[0] - start) / count
+    finally:
+        tracemalloc.stop()
+
+    print('Received packet uses %d bytes, %d bytes after accessing sender.' % (per_packet, per_packet_accessed))
+    # Lazy attributes are only allocated when accessed
+    assert per_packet < per_packet_accessed
+    # Absolute sizes depend on the interpreter version and allocator, so only checked with the benchmarks.
+    # Previously (list data, instance dictionaries, parsed created for each packet) ~620 and ~830 bytes.
+    if os.environ.get('WITH_TIMINGS', None) == '1':
+        assert per_packet < 400
+        assert per_packet_accessed < 600
+
+
+def test_packet_pickle():
+    frame = bytearray([
+        0x55,
+        0x00, 0x0A, 0x07, 0x01,
+        0xEB,
+        0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+        0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+        0x75
+    ])
+    # Lazy attributes, which haven't been parsed yet, are parsed after copying
+    for copy_packet in (lambda packet: pickle.loads(pickle.dumps(packet, 2)), copy.deepcopy, copy.copy):
+        packet = copy_packet(Packet.parse_frame(frame))
+        assert packet.sender == [0x01, 0x81, 0xB7, 0x44]
+        assert packet.learn is False
+        assert packet.rorg_func is None
+        assert packet.parsed == {}
+        assert packet == Packet.parse_frame(frame)
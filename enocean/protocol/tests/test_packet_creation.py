@@ -1,5 +1,7 @@
 # -*- encoding: utf-8 -*-
 from __future__ import print_function, unicode_literals, division, absolute_import
+import copy
+import pickle
 from nose.tools import raises
 
 from enocean.protocol.packet import Packet, RadioPacket
@@ -312,6 +314,47 @@ def test_vld():
     assert packet.parsed['OV']['value'] == 'Output value 100% or ON'
 
 
+def test_lazy_values():
+    packet = RadioPacket.create(
+        rorg=RORG.BS4, rorg_func=0x02, rorg_type=0x05, sender=[0x01, 0x81, 0xB7, 0x44], TMP=26.5)
+    # Values are decoded only when needed
+    assert not isinstance(packet._parsed, dict)
+    assert packet.sender_int == 0x0181B744
+    assert packet.learn is False
+    assert packet.rorg_func == 0x02
+    assert round(packet.parsed['TMP']['value'], 1) == 26.5
+    assert packet.parse_eep() == ['TMP']
+    assert list(packet.parsed.keys()) == ['TMP']
+    # Values correspond to the parsed packet
+    assert Packet.parse_msg(packet.build())[2].parse_eep(0x02, 0x05) == packet.parse_eep()
+
+
+def test_lazy_values_copy():
+    for copy_packet in (lambda packet: pickle.loads(pickle.dumps(packet, 2)), copy.deepcopy):
+        packet = copy_packet(RadioPacket.create(
+            rorg=RORG.BS4, rorg_func=0x02, rorg_type=0x05, sender=[0x01, 0x81, 0xB7, 0x44], TMP=20))
+        assert round(packet.parsed['TMP']['value']) == 20
+        assert packet.learn is False
+
+
+def test_undefined_enum():
+    # Enum fields left out default to 0, which isn't defined for CTM of A5-11-02
+    try:
+        RadioPacket.create(rorg=RORG.BS4, rorg_func=0x11, rorg_type=0x02, sender=[0x01, 0x81, 0xB7, 0x44])
+        assert False
+    except ValueError:
+        pass
+    packet = RadioPacket.create(
+        rorg=RORG.BS4, rorg_func=0x11, rorg_type=0x02, sender=[0x01, 0x81, 0xB7, 0x44], CTM='Heating')
+    assert packet.parsed['CTM']['raw_value'] == 1
+
+
+@timing(1000)
+def test_create_speed():
+    RadioPacket.create(rorg=RORG.VLD, rorg_func=0x01, rorg_type=0x01, command=1, sender=[0xDE, 0xAD, 0xBE, 0xEF],
+                       destination=[0xFF, 0xFF, 0xFF, 0xFF], DV=0, IO=0x1E, OV=0x64)
+
+
 def test_fails():
     try:
         Packet.create(PACKET.RESPONSE, 0xA5, 0x01, 0x01)
@@ -0,0 +1,174 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+import os
+import shutil
+import tempfile
+
+from enocean.protocol.packet import Packet, RadioPacket
+from enocean.protocol.constants import PACKET
+from enocean.protocol.registry import DeviceRegistry
+from enocean.decorators import timing
+
+TEMPERATURE = bytes(bytearray([
+    0x55,
+    0x00, 0x0A, 0x07, 0x01,
+    0xEB,
+    0xA5, 0x00, 0x00, 0x55, 0x08, 0x01, 0x81, 0xB7, 0x44, 0x00,
+    0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x2D, 0x00,
+    0x75
+]))
+
+
+def test_registry():
+    registry = DeviceRegistry()
+    device = registry.add([0x01, 0x81, 0xB7, 0x44], 0xA5, 0x02, 0x05)
+    assert device.sender == 0x0181B744
+    assert len(registry) == 1
+    assert 0x0181B744 in registry
+    assert [0x01, 0x81, 0xB7, 0x44] in registry
+    assert registry.get(0x0181B744) is device
+    assert list(registry) == [device]
+
+    packet = Packet.parse_frame(TEMPERATURE)
+    values = registry.decode(packet)
+    assert list(values.keys()) == ['TMP']
+    assert round(values['TMP']['value'], 1) == 26.7
+    assert packet.parsed['TMP'] == values['TMP']
+    assert packet.rorg_func == 0x02
+    assert packet.rorg_type == 0x05
+
+    values = registry.decode(Packet.parse_frame(TEMPERATURE), fields=('TMP', ))
+    assert list(values.keys()) == ['TMP']
+    assert registry.decode(Packet.parse_frame(TEMPERATURE), fields=()) == {}
+
+    assert registry.remove(0x0181B744) is device
+    assert registry.remove(0x0181B744) is None
+    packet = Packet.parse_frame(TEMPERATURE)
+    assert registry.decode(packet) is None
+    assert packet.parsed == {}
+
+
+def test_registry_mismatch():
+    registry = DeviceRegistry()
+    # Device with different RORG
+    registry.add(0x0181B744, 0xF6, 0x02, 0x01)
+    assert registry.decode(Packet.parse_frame(TEMPERATURE)) is None
+
+    try:
+        registry.add(0x0181B744, 0xA5, 0xFF, 0xFF)
+    except ValueError:
+        pass
+    else:
+        assert False, 'Unknown profiles should raise ValueError'
+
+
+def test_registry_commands():
+    registry = DeviceRegistry()
+    registry.add(0x0194E3B9, 0xD2, 0x01, 0x01)
+    # D2-01-01 telegrams, "Actuator Set Output" (command 1) and "Actuator Status Response" (command 4)
+    optional = [0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00]
+    values = registry.decode(
+        RadioPacket(PACKET.RADIO_ERP1, data=[0xD2, 0x01, 0x1E, 0x64, 0x01, 0x94, 0xE3, 0xB9, 0x00], optional=optional))
+    assert list(values.keys()) == ['CMD', 'DV', 'IO', 'OV']
+    values = registry.decode(
+        RadioPacket(PACKET.RADIO_ERP1, data=[0xD2, 0x04, 0x00, 0x64, 0x01, 0x94, 0xE3, 0xB9, 0x00], optional=optional))
+    assert values['OV']['raw_value'] == 100
+    assert 'PF' in values
+
+    # Fixed command
+    registry.add(0x0194E3B9, 0xD2, 0x01, 0x01, command=1)
+    assert registry.get(0x0194E3B9).commands is None
+
+
+LARGE_REGISTRY = DeviceRegistry()
+for sender in range(0x01000000, 0x01000000 + 20000):
+    LARGE_REGISTRY.add(sender, 0xA5, 0x02, 0x05)
+LARGE_REGISTRY.add(0x0181B744, 0xA5, 0x02, 0x05)
+
+
+@timing(1000)
+def test_registry_lookup():
+    assert len(LARGE_REGISTRY) == 20001
+    packet = Packet.parse_frame(TEMPERATURE)
+    assert LARGE_REGISTRY.decode(packet) is not None
+    packet = Packet.parse_frame(TEMPERATURE)
+    packet.sender = [0xFF, 0x00, 0x00, 0x00]
+    assert LARGE_REGISTRY.decode(packet) is None
+
+
+def test_learn():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'devices.log')
+    try:
+        registry = DeviceRegistry(path=path)
+        # 4BS teach-in, with EEP A5-02-05
+        teach_in = Packet.parse_frame(bytes(bytearray([
+            0x55,
+            0x00, 0x0A, 0x07, 0x01,
+            0xEB,
+            0xA5, 0x08, 0x28, 0x46, 0x80, 0x01, 0x8A, 0x7B, 0x30, 0x00,
+            0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x49, 0x00,
+            0x26
+        ])))
+        device = registry.learn(teach_in)
+        assert device.sender == 0x018A7B30
+        assert (device.rorg, device.rorg_func, device.rorg_type) == (0xA5, 0x02, 0x05)
+        # Teach-in telegrams aren't decoded as data
+        assert registry.decode(teach_in) is None
+        # Data telegrams aren't teach-ins
+        assert registry.learn(Packet.parse_frame(TEMPERATURE)) is None
+
+        # UTE teach-in, with EEP D2-01-01
+        ute = Packet.parse_frame(bytes(bytearray([
+            0x55,
+            0x00, 0x0D, 0x07, 0x01,
+            0xFD,
+            0xD4, 0xA0, 0xFF, 0x3E, 0x00, 0x01, 0x01, 0xD2, 0x01, 0x94, 0xE3, 0xB9, 0x00,
+            0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00,
+            0xAB
+        ])))
+        device = registry.learn(ute)
+        assert device.sender == 0x0194E3B9
+        assert (device.rorg, device.rorg_func, device.rorg_type) == (0xD2, 0x01, 0x01)
+        # Learning the same profile again doesn't grow the log
+        assert registry.learn(ute) is device
+
+        registry.add(0x01020304, 0xF6, 0x02, 0x01)
+        registry.remove(0x01020304)
+
+        # Registry is reloaded from the log
+        reloaded = DeviceRegistry(path=path)
+        assert len(reloaded) == 2
+        assert reloaded.get(0x018A7B30).rorg_type == 0x05
+        assert reloaded.get(0x0194E3B9).rorg == 0xD2
+        assert 0x01020304 not in reloaded
+
+        # Data telegrams from the learned device are decoded
+        packet = Packet.parse_frame(bytes(bytearray([
+            0x55,
+            0x00, 0x09, 0x07, 0x01,
+            0x56,
+            0xD2, 0x04, 0x00, 0x64, 0x01, 0x94, 0xE3, 0xB9, 0x00,
+            0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00,
+            0xE4
+        ])))
+        assert reloaded.decode(packet)['OV']['raw_value'] == 100
+
+        with open(path, 'r') as log_file:
+            assert len(log_file.readlines()) == 4
+        reloaded.compact()
+        with open(path, 'r') as log_file:
+            assert len(log_file.readlines()) == 2
+        assert len(DeviceRegistry(path=path)) == 2
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_unwritable_log():
+    directory = tempfile.mkdtemp()
+    registry = DeviceRegistry(path=os.path.join(directory, 'devices.log'))
+    shutil.rmtree(directory)
+    # Devices are kept in memory, if the log can't be written
+    device = registry.add(0x0181B744, 0xA5, 0x02, 0x05)
+    assert registry.get(0x0181B744) is device
+    assert registry.remove(0x0181B744) is device
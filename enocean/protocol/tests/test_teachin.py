@@ -42,3 +42,24 @@ def test_ute_in():
     assert response_packet.destination_hex == '01:94:E3:B9'
     assert response_packet._bit_data[DB6.BIT_5:DB6.BIT_3] == [False, True]
     assert response_packet.data[2:7] == packet.data[2:7]
+
+
+def test_ute_contains_eep():
+    status, buf, packet = Packet.parse_msg(
+        bytearray([
+            0x55,
+            0x00, 0x0D, 0x07, 0x01,
+            0xFD,
+            0xD4, 0xA0, 0xFF, 0x3E, 0x00, 0x01, 0x01, 0xD2, 0x01, 0x94, 0xE3, 0xB9, 0x00,
+            0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00,
+            0xAB
+        ])
+    )
+    assert packet.contains_eep is True
+    # contains_eep can be overridden like the other parsed attributes
+    packet.contains_eep = False
+    assert packet.contains_eep is False
+    assert packet.rorg_func == 0x01
+    # ... until the packet is parsed again
+    packet.parse()
+    assert packet.contains_eep is True
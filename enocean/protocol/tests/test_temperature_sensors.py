@@ -14,8 +14,8 @@ def test_first_range():
         maximum = minimum + 40
         profile = eep.find_profile([], 0xA5, 0x02, values[i])
 
-        assert minimum == float(profile.find('value', {'shortcut': 'TMP'}).find('scale').find('min').text)
-        assert maximum == float(profile.find('value', {'shortcut': 'TMP'}).find('scale').find('max').text)
+        assert minimum == profile.shortcuts['TMP'].scale_min
+        assert maximum == profile.shortcuts['TMP'].scale_max
 
 
 def test_second_range():
@@ -26,15 +26,15 @@ def test_second_range():
         maximum = minimum + 80
         profile = eep.find_profile([], 0xA5, 0x02, values[i])
 
-        assert minimum == float(profile.find('value', {'shortcut': 'TMP'}).find('scale').find('min').text)
-        assert maximum == float(profile.find('value', {'shortcut': 'TMP'}).find('scale').find('max').text)
+        assert minimum == profile.shortcuts['TMP'].scale_min
+        assert maximum == profile.shortcuts['TMP'].scale_max
 
 
 def test_rest():
     profile = eep.find_profile([], 0xA5, 0x02, 0x20)
-    assert -10 == float(profile.find('value', {'shortcut': 'TMP'}).find('scale').find('min').text)
-    assert +41.2 == float(profile.find('value', {'shortcut': 'TMP'}).find('scale').find('max').text)
+    assert -10 == profile.shortcuts['TMP'].scale_min
+    assert +41.2 == profile.shortcuts['TMP'].scale_max
 
     profile = eep.find_profile([], 0xA5, 0x02, 0x30)
-    assert -40 == float(profile.find('value', {'shortcut': 'TMP'}).find('scale').find('min').text)
-    assert +62.3 == float(profile.find('value', {'shortcut': 'TMP'}).find('scale').find('max').text)
+    assert -40 == profile.shortcuts['TMP'].scale_min
+    assert +62.3 == profile.shortcuts['TMP'].scale_max
@@ -0,0 +1,55 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function, unicode_literals, division, absolute_import
+
+from enocean.protocol import crc8
+from enocean.protocol.framedecoder import FrameDecoder
+from enocean.protocol.packet import RadioPacket
+from enocean.protocol.template import PacketTemplate
+from enocean.protocol.constants import RORG
+from enocean.decorators import timing
+
+SENDER = [0xDE, 0xAD, 0xBE, 0xEF]
+TEMPLATE = PacketTemplate(RORG.VLD, 0x01, 0x01, command=1, sender=SENDER, DV=0, IO=0x1E, OV=0x64)
+
+
+def switch(destination, sender=SENDER):
+    return bytes(bytearray(RadioPacket.create(
+        RORG.VLD, 0x01, 0x01, command=1, destination=destination, sender=sender, DV=0, IO=0x1E, OV=0x64).build()))
+
+
+def test_template():
+    assert TEMPLATE.frame([0x01, 0x02, 0x03, 0x04]) == switch([0x01, 0x02, 0x03, 0x04])
+    assert TEMPLATE.frame(0x01020304) == switch([0x01, 0x02, 0x03, 0x04])
+    assert TEMPLATE.frame(0x01020304, sender=0xFFB3C401) == switch([0x01, 0x02, 0x03, 0x04], [0xFF, 0xB3, 0xC4, 0x01])
+    assert TEMPLATE.frame() == switch([0xFF, 0xFF, 0xFF, 0xFF])
+
+    packet = TEMPLATE.packet(0x01020304)
+    assert packet.destination == [0x01, 0x02, 0x03, 0x04]
+    assert packet.sender == SENDER
+    assert packet.parse_eep(0x01, 0x01) == ['CMD', 'DV', 'IO', 'OV']
+    assert packet.parsed['OV']['raw_value'] == 0x64
+
+    try:
+        TEMPLATE.frame([0x01, 0x02])
+        assert False
+    except ValueError:
+        pass
+
+
+def test_frames():
+    destinations = list(range(0x01000000, 0x01000000 + 300))
+    frames = FrameDecoder().feed(TEMPLATE.frames(destinations))
+    assert len(frames) == 300
+    assert [bytes(frame) for frame in frames] == [TEMPLATE.frame(destination) for destination in destinations]
+    assert TEMPLATE.frames([]) == b''
+
+
+def test_crc_continuation():
+    data = bytearray(range(200))
+    assert crc8.calc(data[50:], crc8.calc(data[:50])) == crc8.calc(data)
+    assert crc8.calc(list(data[150:]), crc8.calc(data[:150])) == crc8.calc(data)
+
+
+@timing(100)
+def test_frames_speed():
+    TEMPLATE.frames(range(300))
@@ -28,3 +28,30 @@ def test_from_hex_string():
 
     assert enocean.utils.from_hex_string('00:0F:10:16') == [0, 15, 16, 22]
     assert enocean.utils.from_hex_string('00:0F:10:16') == [0x00, 0x0F, 0x10, 0x16]
+
+
+def test_bit_view():
+    from enocean.protocol.constants import DB0, DB1, DB3
+    bits = enocean.utils.BitView([0x08, 0x28, 0x46, 0x80])
+    assert len(bits) == 32
+    assert bits == enocean.utils.to_bitarray([0x08, 0x28, 0x46, 0x80], 32)
+    assert bits.get(0, 6) == 0x02
+    assert bits.get(DB3.BIT_1, 7) == 0x05
+    assert bits.get(DB0.BIT_7) == 1
+    assert bits[DB0.BIT_7] is True
+    assert bits[DB0.BIT_3] is False
+    assert bits[DB3.BIT_7:DB3.BIT_1] == [False, False, False, False, True, False]
+    assert enocean.utils.from_bitarray(bits[DB3.BIT_7:DB3.BIT_1]) == 0x02
+
+    bits.set(DB1.BIT_7, 8, 0xFF)
+    assert bits.value == 0x0828FF80
+    bits[DB0.BIT_7] = False
+    assert bits.value == 0x0828FF00
+    bits[DB0.BIT_1:] = [True, True]
+    assert list(bits.to_bytes()) == [0x08, 0x28, 0xFF, 0x03]
+    assert enocean.utils.from_bitarray(bits) == 0x0828FF03
+
+    # Values are masked to the width of the field
+    bits.set(0, 4, 0x1F)
+    assert bits.get(0, 4) == 0x0F
+    assert bits.get(4, 4) == 0x08
@@ -16,15 +16,113 @@ def combine_hex(data):
 
 
 def to_bitarray(data, width=8):
-    ''' Convert data (list of integers, bytearray or integer) to bitarray '''
-    if isinstance(data, list) or isinstance(data, bytearray):
+    ''' Convert data (list of integers, bytes, bytearray or integer) to bitarray '''
+    if isinstance(data, (list, bytes, bytearray)):
         data = combine_hex(data)
     return [True if digit == '1' else False for digit in bin(data)[2:].zfill(width)]
 
 
 def from_bitarray(data):
-    ''' Convert bit array back to integer '''
-    return int(''.join(['1' if x else '0' for x in data]), 2)
+    ''' Convert bit array (list of booleans or BitView) back to integer '''
+    if isinstance(data, BitView):
+        return data.value
+    output = 0
+    for bit in data:
+        output = (output << 1) | (1 if bit else 0)
+    return output
+
+
+class BitView(object):
+    '''
+    Fixed width bit field, backed by an integer.
+    Bits are numbered from the most significant bit, as the offsets in EEP.xml.
+    Fields are read and written with get() and set(), which use shifts and masks.
+
+    For compatibility with the lists returned by to_bitarray(), single bits can be accessed
+    by index (negative indexes, such as DB0.BIT_3, count from the least significant bit)
+    and slices return lists of booleans.
+    '''
+    __slots__ = ('value', 'width')
+
+    def __init__(self, data=0, width=None):
+        if isinstance(data, (list, bytes, bytearray)):
+            if width is None:
+                width = len(data) * 8
+            data = combine_hex(data)
+        if width is None:
+            width = 8
+        self.width = max(width, 0)
+        self.value = data & ((1 << self.width) - 1)
+
+    def _offset(self, offset):
+        if offset < 0:
+            offset += self.width
+        if not 0 <= offset < self.width:
+            raise IndexError('Bit index out of range')
+        return offset
+
+    def get(self, offset, size=1):
+        ''' Get field of size bits, starting from offset, as integer '''
+        offset = self._offset(offset)
+        if offset + size > self.width:
+            raise IndexError('Bit field out of range')
+        return (self.value >> (self.width - offset - size)) & ((1 << size) - 1)
+
+    def set(self, offset, size, value):
+        ''' Set field of size bits, starting from offset, to integer value '''
+        offset = self._offset(offset)
+        if offset + size > self.width:
+            raise IndexError('Bit field out of range')
+        shift = self.width - offset - size
+        mask = ((1 << size) - 1) << shift
+        self.value = (self.value & ~mask) | ((int(value) << shift) & mask)
+
+    def to_bytes(self):
+        ''' Bit field as bytearray, the width is rounded up to full bytes '''
+        return bytearray((self.value >> shift) & 0xFF for shift in range((self.width + 7) // 8 * 8 - 8, -1, -8))
+
+    def __len__(self):
+        return self.width
+
+    def __int__(self):
+        return self.value
+
+    def __iter__(self):
+        for shift in range(self.width - 1, -1, -1):
+            yield (self.value >> shift) & 0x01 == 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get(offset) == 1 for offset in range(*index.indices(self.width))]
+        return self.get(index) == 1
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            offsets = range(*index.indices(self.width))
+            if len(offsets) != len(value):
+                raise ValueError('BitView slices can\'t be resized')
+            for offset, bit in zip(offsets, value):
+                self.set(offset, 1, 1 if bit else 0)
+            return
+        self.set(index, 1, 1 if value else 0)
+
+    def __eq__(self, other):
+        if isinstance(other, BitView):
+            return self.width == other.width and self.value == other.value
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'BitView(0x%X, width=%d)' % (self.value, self.width)
 
 
 def to_hex_string(data):
@@ -26,4 +26,7 @@ setup(
         'enum-compat>=0.0.2',
         'pyserial>=3.0',
         'beautifulsoup4>=4.3.2',
-    ])
+    ],
+    extras_require={
+        'bulk': ['numpy'],
+    })